@@ -0,0 +1,154 @@
+# backend/benchmarks/fake_typesense.py
+"""
+A stand-in Typesense server for load tests.
+
+    python benchmarks/fake_typesense.py [--port 8108] [--latency-ms 5] [--jitter-ms 2]
+                                        [--error-rate 0.0] [--hits 10]
+
+Answers the calls the backend makes (collection lookup, search, multi_search, import,
+health, debug) with canned, Typesense-shaped responses after a configurable delay, and
+fails a configurable fraction of data requests with 503 like a lagging node. Nothing is
+stored: searches return generated hits and imports succeed for every line.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from typing import Dict
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+LANGUAGES = ("Python", "Go", "Rust", "JavaScript", "Java", "C++", "Ruby", "TypeScript")
+LICENSES = ("MIT", "Apache-2.0", "GPL-3.0", "BSD-3-Clause")
+
+
+def search_body(hits: int, per_page: int, page: int, query: str) -> bytes:
+    """A search response with ``min(hits, per_page)`` generated documents"""
+    return json.dumps({
+        "facet_counts": [
+            {"field_name": "language", "counts": [{"value": value, "count": 100 - i} for i, value in enumerate(LANGUAGES)]},
+            {"field_name": "license", "counts": [{"value": value, "count": 50 - i} for i, value in enumerate(LICENSES)]},
+        ],
+        "found": hits * 20,
+        "hits": [{
+            "document": {
+                "Id-repo": f"org{i}-repo{i}",
+                "name": f"{query or 'project'}-{i}",
+                "organisation": f"org{i % 7}",
+                "url": f"https://github.com/org{i % 7}/repo{i}",
+                "description": "Open source tooling for measuring and reducing carbon emissions. " * 2,
+                "language": LANGUAGES[i % len(LANGUAGES)],
+                "license": LICENSES[i % len(LICENSES)],
+                "latest_update": 1717000000 + i,
+                "last_commit": 1717000000 + i,
+            },
+            "highlights": [],
+            "text_match": 578730123365187705 - i,
+        } for i in range(min(hits, per_page))],
+        "out_of": hits * 200,
+        "page": page,
+        "request_params": {"collection_name": "ossfinder", "per_page": per_page, "q": query},
+        "search_cutoff": False,
+        "search_time_ms": 1,
+    }).encode("utf-8")
+
+
+def create_app(latency_ms: float = 5.0, jitter_ms: float = 2.0, error_rate: float = 0.0,
+               hits: int = 10, seed: int = 0) -> Starlette:
+    rng = random.Random(seed)
+    bodies: Dict[tuple, bytes] = {}
+
+    async def delay_or_fail():
+        """Sleep like a real node; return a 503 response for injected failures"""
+        await asyncio.sleep(max(0.0, rng.gauss(latency_ms, jitter_ms)) / 1000)
+        if error_rate and rng.random() < error_rate:
+            return JSONResponse({"message": "Not Ready or Lagging"}, status_code=503)
+        return None
+
+    def search_response(params) -> bytes:
+        per_page = int(params.get("per_page", 10))
+        page = int(params.get("page", 1))
+        query = str(params.get("q", ""))[:40]
+        key = (per_page, page, query)
+        if key not in bodies:
+            if len(bodies) > 10000:
+                bodies.clear()
+            bodies[key] = search_body(hits, per_page, page, query)
+        return bodies[key]
+
+    async def health(request: Request):
+        return JSONResponse({"ok": True})
+
+    async def debug(request: Request):
+        return JSONResponse({"state": 1, "version": "fake"})
+
+    async def collection(request: Request):
+        return JSONResponse({"name": request.path_params["name"], "fields": [], "num_documents": hits * 20})
+
+    async def create_collection(request: Request):
+        return JSONResponse(json.loads(await request.body()), status_code=201)
+
+    async def search(request: Request):
+        failure = await delay_or_fail()
+        return failure or Response(search_response(request.query_params), media_type="application/json")
+
+    async def multi_search(request: Request):
+        failure = await delay_or_fail()
+        if failure:
+            return failure
+        searches = json.loads(await request.body()).get("searches", [])
+        results = b",".join(search_response(search) for search in searches)
+        return Response(b'{"results":[' + results + b"]}", media_type="application/json")
+
+    async def import_documents(request: Request):
+        body = await request.body()
+        failure = await delay_or_fail()
+        if failure:
+            return failure
+        lines = sum(1 for line in body.splitlines() if line.strip())
+        return Response("\n".join(['{"success":true}'] * lines), media_type="text/plain")
+
+    async def document(request: Request):
+        failure = await delay_or_fail()
+        if failure:
+            return failure
+        if request.method == "DELETE":
+            return JSONResponse({"id": request.path_params["id"]})
+        return JSONResponse({"message": "Could not find a document"}, status_code=404)
+
+    return Starlette(routes=[
+        Route("/health", health),
+        Route("/debug", debug),
+        Route("/collections", create_collection, methods=["POST"]),
+        Route("/collections/{name}", collection),
+        Route("/collections/{name}/documents/search", search),
+        Route("/collections/{name}/documents/import", import_documents, methods=["POST"]),
+        Route("/collections/{name}/documents/{id}", document, methods=["GET", "DELETE"]),
+        Route("/multi_search", multi_search, methods=["POST"]),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8108)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=2.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hits", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(
+        create_app(args.latency_ms, args.jitter_ms, args.error_rate, args.hits, args.seed),
+        host=args.host, port=args.port, log_level="warning", access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# backend/benchmarks/generate_dataset.py
+"""
+Synthetic ossfinder documents for ingestion benchmarks.
+
+    python benchmarks/generate_dataset.py --size 100k [--format ndjson] [--seed 0] --output data.ndjson
+
+Documents look like the ossfinder export: all 14 schema fields as strings, empty strings
+for missing values, dates as YYYY-MM-DD, ``is_fork`` as "True"/"False". Repositories are
+spread over organisations with a Zipf-like skew (a few organisations own many
+repositories), descriptions have a long-tailed length distribution, and a small share
+of documents leave optional fields empty. The same seed and size always produce the same
+documents, so benchmark runs are comparable. Documents are generated lazily, so writing
+a 1M dataset does not hold it in memory.
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import date, timedelta
+from typing import Dict, Iterator
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+
+HOSTS = (("github.com", 0.85), ("gitlab.com", 0.1), ("codeberg.org", 0.03), ("gitlab.awi.de", 0.02))
+LANGUAGES = (
+    ("Python", 0.3), ("", 0.12), ("R", 0.1), ("Jupyter Notebook", 0.1), ("C++", 0.06), ("JavaScript", 0.06),
+    ("Julia", 0.05), ("Fortran", 0.05), ("Java", 0.04), ("Go", 0.03), ("TypeScript", 0.03), ("Rust", 0.02),
+    ("MATLAB", 0.02), ("C", 0.02),
+)
+LICENSES = (
+    ("MIT License", 0.3), ("Apache License 2.0", 0.18), ("", 0.14), ("GNU General Public License v3.0 only", 0.12),
+    ("Other", 0.08), ("BSD 3-Clause \"New\" or \"Revised\" License", 0.08), ("GNU Lesser General Public License v3.0", 0.04),
+    ("Mozilla Public License 2.0", 0.03), ("Creative Commons Attribution 4.0 International", 0.03),
+)
+BRANCHES = (("main", 0.55), ("master", 0.4), ("develop", 0.05))
+TOPICS = (
+    "solar", "wind", "carbon", "emissions", "climate", "energy", "grid", "battery", "hydrogen", "biodiversity",
+    "forest", "ocean", "ice sheet", "hydrology", "air quality", "mobility", "building", "heat pump", "agriculture",
+    "land use", "weather", "satellite", "life cycle assessment", "circular economy", "smart meter",
+)
+KINDS = ("model", "toolkit", "dashboard", "library", "simulator", "dataset", "API", "pipeline", "optimizer", "framework")
+WORDS = (
+    "open", "source", "data", "analysis", "simulation", "forecasting", "measurement", "estimation", "scenario",
+    "policy", "regional", "global", "high-resolution", "time series", "python", "package", "for", "and", "of",
+    "the", "with", "using", "large-scale", "coupled", "physical", "statistical", "machine learning", "framework",
+)
+
+
+def _choice(rng: random.Random, weighted) -> str:
+    values, weights = zip(*weighted)
+    return rng.choices(values, weights)[0]
+
+
+def _date(rng: random.Random, start: date = date(2015, 1, 1), days: int = 3650) -> str:
+    return (start + timedelta(days=rng.randrange(days))).isoformat()
+
+
+def _description(rng: random.Random, topic: str, kind: str) -> str:
+    """Mostly a sentence or two, sometimes a paragraph, sometimes nothing"""
+    if rng.random() < 0.08:
+        return ""
+    length = min(1500, int(rng.lognormvariate(4.8, 0.7)))  # median ~120 characters
+    words = [f"A {topic} {kind}"]
+    size = len(words[0])
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words) + "."
+
+
+def generate_documents(count: int, seed: int = 0) -> Iterator[Dict[str, str]]:
+    """Yield ``count`` ossfinder-shaped documents with unique Id-repo values"""
+    rng = random.Random(seed)
+    organisations = max(1, count // 8)
+    for index in range(count):
+        # Zipf-like: low organisation numbers own most repositories
+        organisation = f"org-{int(organisations ** rng.random()) - 1:06d}"
+        topic, kind = rng.choice(TOPICS), rng.choice(KINDS)
+        name = f"{topic.replace(' ', '-')}-{kind.lower()}-{index}"
+        host = _choice(rng, HOSTS)
+        is_fork = rng.random() < 0.05
+        last_commit = _date(rng) if rng.random() > 0.05 else ""
+        yield {
+            "Id-repo": f"{organisation}/{name}",
+            "name": name,
+            "organisation": organisation,
+            "url": f"https://{host}/{organisation}/{name}",
+            "website": f"https://{name}.readthedocs.io" if rng.random() < 0.2 else "",
+            "description": _description(rng, topic, kind),
+            "license": _choice(rng, LICENSES),
+            "latest_update": last_commit if rng.random() > 0.3 else "",
+            "language": _choice(rng, LANGUAGES),
+            "last_commit": last_commit,
+            "open_pull_requests": str(int(rng.paretovariate(1.5)) - 1) if rng.random() > 0.3 else "",
+            "master_branch": _choice(rng, BRANCHES),
+            "is_fork": "True" if is_fork else "False",
+            "forked_from": f"upstream-{rng.randrange(organisations):06d}/{name}" if is_fork else "",
+        }
+
+
+def parse_size(value: str) -> int:
+    return SIZES[value] if value in SIZES else int(value)
+
+
+def write_dataset(out, count: int, seed: int = 0, fmt: str = "json") -> None:
+    """Write documents as a JSON array (the /upload body) or as NDJSON"""
+    documents = generate_documents(count, seed)
+    if fmt == "ndjson":
+        for document in documents:
+            out.write(json.dumps(document) + "\n")
+        return
+    out.write("[")
+    for index, document in enumerate(documents):
+        out.write(("," if index else "") + json.dumps(document))
+    out.write("]\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=parse_size, default="10k", help="10k, 100k, 1M or a number")
+    parser.add_argument("--format", choices=("json", "ndjson"), default="json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file to write (default: stdout)")
+    args = parser.parse_args()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            write_dataset(out, args.size, args.seed, args.format)
+    else:
+        write_dataset(sys.stdout, args.size, args.seed, args.format)
+
+
+if __name__ == "__main__":
+    main()
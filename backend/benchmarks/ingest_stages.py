@@ -0,0 +1,186 @@
+# backend/benchmarks/ingest_stages.py
+"""
+Where /upload spends its time, stage by stage, as the dataset grows.
+
+    PYTHONPATH=src python benchmarks/ingest_stages.py [--sizes 10k,100k] [--rounds 3]
+                                                      [--batch-size 1000] [--output ingest.json]
+
+For each size a synthetic dataset (generate_dataset.py) is timed through the stages of
+the upload pipeline, each on its own so the slowest one stands out:
+
+    parse       decoding the JSON array body (what /upload does with the request body)
+    validate    the Id-repo check /upload runs over every document
+    ndjson      iter_ndjson_documents() on the same documents as NDJSON (parse + validate)
+    normalize   TypesenseClient._prepare_document(), the per-document loop at the top of
+                _index_data_impl (schema coercion and id)
+    submit      TypesenseClient._import_batch() for every batch: JSONL encoding, the HTTP
+                round trip to a Typesense stand-in that answers instantly, and parsing the
+                per-document results
+    index       _index_data_impl() end to end (normalize + concurrent submit + summary)
+
+Typesense's own indexing time is not included; benchmarks/loadtest.py covers the
+networked path. Each stage reports the best of --rounds as total seconds, documents per
+second and microseconds per document, and the report is printed as JSON with the commit
+so runs are comparable. --sizes 1M needs several GB of memory.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+os.environ.setdefault("TYPESENSE_API_KEY", "benchmark")
+
+import httpx  # noqa: E402
+from app.routes.upload import iter_ndjson_documents  # noqa: E402
+from app.typesense_client import TypesenseClient, set_testing_mode  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).parent))
+from generate_dataset import generate_documents, parse_size  # noqa: E402
+
+
+class NDJSONRequest:
+    """Just enough of a Starlette Request for iter_ndjson_documents()"""
+
+    def __init__(self, body: bytes, chunk_size: int = 64 * 1024):
+        self.body = body
+        self.chunk_size = chunk_size
+
+    async def stream(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start:start + self.chunk_size]
+
+
+def import_client() -> TypesenseClient:
+    """A TypesenseClient whose imports are answered at once by an in-process transport"""
+    set_testing_mode(True)
+    client = TypesenseClient()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        lines = request.content.count(b"\n") + 1
+        return httpx.Response(200, content=b"\n".join([b'{"success":true}'] * lines))
+
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._initialized = True
+    return client
+
+
+def best_of(rounds: int, prepare: Callable, run: Callable) -> float:
+    """Fastest of ``rounds`` runs of ``run(prepare())``, not counting prepare()"""
+    timings = []
+    for _ in range(rounds):
+        state = prepare()
+        start = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def measure(count: int, args) -> Dict[str, Dict]:
+    documents = list(generate_documents(count, args.seed))
+    body = json.dumps(documents).encode("utf-8")
+    ndjson = "\n".join(json.dumps(document) for document in documents).encode("utf-8")
+    del documents
+    client = import_client()
+    loop = asyncio.new_event_loop()
+
+    def parse(raw: bytes) -> List[Dict]:
+        return json.loads(raw.decode("utf-8"))
+
+    def fresh() -> List[Dict]:
+        return parse(body)
+
+    def validate(data: List[Dict]) -> None:
+        for document in data:
+            if "Id-repo" not in document:
+                raise ValueError("Missing 'Id-repo' field in document")
+
+    async def read_ndjson() -> None:
+        async for _ in iter_ndjson_documents(NDJSONRequest(ndjson)):
+            pass
+
+    def normalize(data: List[Dict]) -> None:
+        for document in data:
+            client._prepare_document(document)
+
+    def prepared() -> List[List[Dict]]:
+        data = fresh()
+        normalize(data)
+        return [data[i:i + args.batch_size] for i in range(0, len(data), args.batch_size)]
+
+    async def submit(batches: List[List[Dict]]) -> None:
+        for batch in batches:
+            await client._import_batch(batch, "upsert")
+
+    stages = {
+        "parse": best_of(args.rounds, lambda: body, parse),
+        "validate": best_of(args.rounds, fresh, validate),
+        "ndjson": best_of(args.rounds, lambda: None, lambda _: loop.run_until_complete(read_ndjson())),
+        "normalize": best_of(args.rounds, fresh, normalize),
+        "submit": best_of(args.rounds, prepared, lambda batches: loop.run_until_complete(submit(batches))),
+        "index": best_of(args.rounds, fresh, lambda data: loop.run_until_complete(
+            client._index_data_impl(data, "upsert", args.batch_size)
+        )),
+    }
+    loop.run_until_complete(client.client.aclose())
+    loop.close()
+
+    report = {"documents": count, "body_mib": round(len(body) / 2**20, 1), "stages": {}}
+    for name, seconds in stages.items():
+        report["stages"][name] = {
+            "seconds": round(seconds, 4),
+            "docs_per_second": round(count / seconds) if seconds else None,
+            "us_per_doc": round(seconds / count * 1e6, 2),
+        }
+    return report
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10k,100k", help="comma-separated: 10k, 100k, 1M or numbers")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="also write the JSON report here")
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes.split(","):
+        results[size] = measure(parse_size(size), args)
+        # ndjson and index overlap the single stages, so they don't compete for slowest
+        stages = {name: stage for name, stage in results[size]["stages"].items() if name not in ("ndjson", "index")}
+        slowest = max(stages, key=lambda name: stages[name]["seconds"])
+        print(f"{size}: slowest stage {slowest} ({stages[slowest]['us_per_doc']} us/doc)", file=sys.stderr)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {name: str(value) for name, value in vars(args).items() if name != "output"},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+# backend/benchmarks/loadtest.py
+"""
+Throughput and tail latency of the backend and frontend under load.
+
+    python benchmarks/loadtest.py [--scenarios search,upload,home] [--qps 100]
+                                  [--duration 10] [--warmup 2] [--typesense-latency-ms 5]
+                                  [--typesense-error-rate 0.0] [--output results.json]
+
+Starts fake_typesense.py, the backend and the frontend as uvicorn processes on free local
+ports, the backend pointed at the fake Typesense and the frontend at the backend. Then
+drives each scenario with an open-loop asyncio load generator: requests are sent on a
+fixed schedule at ``--qps`` whether or not earlier ones have finished, and latency is
+measured from the scheduled send time, so a slow server cannot hide its queueing delay
+by slowing the generator down. Requests in the warmup period are not counted.
+
+Scenarios:
+    search  GET  backend /search with --distinct-queries different queries
+    upload  POST backend /upload with --upload-docs documents per request
+    home    GET  frontend /?q=... (backend search plus streamed page rendering)
+
+Prints one JSON document with p50/p95/p99 latency, throughput, error rate and status
+codes per scenario, plus the commit and settings, so runs can be compared across
+commits. The generator itself tops out at a few thousand requests per second; beyond
+that it, not the apps, is the bottleneck.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FRONTEND_DIR = BACKEND_DIR.parent / "frontend"
+WORDS = ("solar", "wind", "carbon", "energy", "grid", "climate", "water", "battery", "emissions",
+         "forest", "ocean", "recycling", "transport", "heat", "sensor", "model", "data", "farm")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class Services:
+    """The fake Typesense, backend and frontend processes for one run"""
+
+    def __init__(self, args):
+        self.args = args
+        self.processes: List[subprocess.Popen] = []
+        self.logs = tempfile.TemporaryDirectory(prefix="loadtest-")
+        self.typesense_port = free_port()
+        self.backend_url = f"http://127.0.0.1:{free_port()}"
+        self.frontend_url = f"http://127.0.0.1:{free_port()}"
+
+    def _start(self, name: str, command: List[str], cwd: Path, env: Dict[str, str]) -> None:
+        log = open(Path(self.logs.name) / f"{name}.log", "wb")
+        self.processes.append(subprocess.Popen(
+            command, cwd=cwd, env={**os.environ, **env}, stdout=log, stderr=subprocess.STDOUT
+        ))
+
+    def _uvicorn(self, url: str) -> List[str]:
+        port = url.rsplit(":", 1)[1]
+        return [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", port,
+                "--no-access-log", "--log-level", "warning", "--workers", str(self.args.workers)]
+
+    def start(self) -> None:
+        args = self.args
+        self._start("typesense", [
+            sys.executable, str(Path(__file__).parent / "fake_typesense.py"),
+            "--port", str(self.typesense_port), "--latency-ms", str(args.typesense_latency_ms),
+            "--jitter-ms", str(args.typesense_jitter_ms), "--error-rate", str(args.typesense_error_rate),
+            "--hits", str(args.hits), "--seed", str(args.seed),
+        ], BACKEND_DIR, {})
+        common = {
+            # DEBUG skips the CSRF check so /upload can be driven without a token
+            "DEBUG": "true",
+            "LOG_LEVEL": "WARNING",
+            "CSRF_SECRET_KEY": "loadtest",
+        }
+        self._start("backend", self._uvicorn(self.backend_url), BACKEND_DIR, {
+            **common,
+            "PYTHONPATH": str(BACKEND_DIR / "src"),
+            "TYPESENSE_API_KEY": "loadtest",
+            "TYPESENSE_HOST": "127.0.0.1",
+            "TYPESENSE_PORT": str(self.typesense_port),
+            "TYPESENSE_NODES": "",
+            "SEARCH_CACHE_TTL_SECONDS": "0" if args.no_cache else os.getenv("SEARCH_CACHE_TTL_SECONDS", "60"),
+        })
+        self._start("frontend", self._uvicorn(self.frontend_url), FRONTEND_DIR, {
+            **common,
+            "PYTHONPATH": str(FRONTEND_DIR / "src"),
+            "BACKEND_URL": self.backend_url,
+        })
+
+    async def wait_ready(self, timeout: float = 30.0) -> None:
+        checks = [
+            f"http://127.0.0.1:{self.typesense_port}/health",
+            f"{self.backend_url}/ready",
+            f"{self.frontend_url}/health",
+        ]
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient(timeout=1.0) as client:
+            for url in checks:
+                while True:
+                    try:
+                        if (await client.get(url)).status_code == 200:
+                            break
+                    except httpx.HTTPError:
+                        pass
+                    if time.monotonic() > deadline or any(p.poll() is not None for p in self.processes):
+                        raise RuntimeError(f"{url} did not become ready:\n{self.log_tails()}")
+                    await asyncio.sleep(0.1)
+
+    def log_tails(self) -> str:
+        tails = []
+        for log in sorted(Path(self.logs.name).glob("*.log")):
+            lines = log.read_text(errors="replace").splitlines()[-20:]
+            tails.append(f"--- {log.name}\n" + "\n".join(lines))
+        return "\n".join(tails)
+
+    def stop(self) -> None:
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.logs.cleanup()
+
+
+async def run_scenario(client: httpx.AsyncClient, send: Callable, args) -> Dict:
+    """Send requests at args.qps for warmup + duration seconds and summarize the measured ones"""
+    loop = asyncio.get_running_loop()
+    interval = 1.0 / args.qps
+    start = loop.time() + 0.05
+    measure_from = start + args.warmup
+    total = int(args.qps * (args.warmup + args.duration))
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    dropped = 0
+    last_done = measure_from
+    in_flight = set()
+
+    async def one(index: int, scheduled: float) -> None:
+        nonlocal last_done
+        try:
+            status = (await send(client, index)).status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        if scheduled >= measure_from:
+            done = loop.time()
+            latencies.append((done - scheduled) * 1000)
+            statuses[status] += 1
+            last_done = max(last_done, done)
+
+    for index in range(total):
+        scheduled = start + index * interval
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= args.max_in_flight:
+            # The server has fallen this far behind; count it rather than queue without bound
+            if scheduled >= measure_from:
+                dropped += 1
+            continue
+        task = asyncio.create_task(one(index, scheduled))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    await asyncio.gather(*in_flight)
+
+    latencies.sort()
+    errors = dropped + sum(count for status, count in statuses.items()
+                           if not isinstance(status, int) or status >= 400)
+    attempted = len(latencies) + dropped
+    elapsed = max(last_done, start + args.warmup + args.duration) - measure_from
+    return {
+        "target_qps": args.qps,
+        "requests": attempted,
+        "dropped": dropped,
+        "errors": errors,
+        "error_rate": round(errors / attempted, 4) if attempted else 0.0,
+        "throughput_rps": round((attempted - errors) / elapsed, 1) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p95": round(percentile(latencies, 0.95), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        },
+        "status_codes": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+    }
+
+
+def scenarios(services: Services, args) -> Dict[str, Callable]:
+    rng = random.Random(args.seed)
+    queries = [" ".join(rng.sample(WORDS, 2)) for _ in range(args.distinct_queries)]
+    documents = [{
+        "Id-repo": f"bench-{i}",
+        "name": f"bench-project-{i}",
+        "organisation": f"org{i % 13}",
+        "url": f"https://github.com/org{i % 13}/bench-project-{i}",
+        "description": "Benchmark document for the upload scenario",
+        "language": "Python",
+        "license": "MIT",
+        "latest_update": "2024-05-29T12:00:00Z",
+        "open_pull_requests": str(i % 9),
+        "is_fork": "false",
+    } for i in range(args.upload_docs)]
+    upload_body = json.dumps(documents).encode("utf-8")
+
+    async def search(client, index):
+        return await client.get(f"{services.backend_url}/search", params={"q": queries[index % len(queries)]})
+
+    async def upload(client, index):
+        return await client.post(f"{services.backend_url}/upload", content=upload_body,
+                                 headers={"Content-Type": "application/json"})
+
+    async def home(client, index):
+        return await client.get(f"{services.frontend_url}/", params={"q": queries[index % len(queries)]})
+
+    return {"search": search, "upload": upload, "home": home}
+
+
+async def run(args) -> Dict:
+    services = Services(args)
+    services.start()
+    try:
+        await services.wait_ready()
+        senders = scenarios(services, args)
+        limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+        results = {}
+        async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+            for name in args.scenarios:
+                results[name] = await run_scenario(client, senders[name], args)
+                print(f"{name}: {json.dumps(results[name]['latency_ms'])}", file=sys.stderr)
+    finally:
+        services.stop()
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "settings": {name: value for name, value in vars(args).items() if name != "output"},
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", type=lambda value: value.split(","), default=["search", "upload", "home"])
+    parser.add_argument("--qps", type=float, default=100)
+    parser.add_argument("--duration", type=float, default=10, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2, help="unmeasured seconds before that")
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers per app")
+    parser.add_argument("--distinct-queries", type=int, default=500)
+    parser.add_argument("--upload-docs", type=int, default=100)
+    parser.add_argument("--no-cache", action="store_true", help="disable the backend search cache")
+    parser.add_argument("--hits", type=int, default=10, help="hits per fake search response")
+    parser.add_argument("--typesense-latency-ms", type=float, default=5)
+    parser.add_argument("--typesense-jitter-ms", type=float, default=2)
+    parser.add_argument("--typesense-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="also write the JSON report here")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - {"search", "upload", "home"}
+    if unknown:
+        parser.error(f"unknown scenarios: {sorted(unknown)}")
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# backend/benchmarks/middleware_overhead.py
+"""
+Per-request cost of the backend middleware stack on /search.
+
+    PYTHONPATH=src python benchmarks/middleware_overhead.py [--requests 20000]
+
+Drives the ASGI app in-process (no sockets, no Typesense): /search answers a fixed
+result, as it does on a cache hit, once bare and once behind CORS, CSRF and request
+logging in the order main.py installs them. The difference is the middleware overhead.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("CSRF_SECRET_KEY", "benchmark")
+os.environ.setdefault("DEBUG", "false")
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+from app.middleware.logging import RequestLoggerMiddleware  # noqa: E402
+from app.middleware.security import CORSMiddlewareNew, CSRFMiddlewareNew  # noqa: E402
+
+RESULT = {"found": 1, "hits": [{"document": {"name": "solar", "organisation": "sun"}}]}
+
+
+async def search(request):
+    return JSONResponse(RESULT)
+
+
+def build_app(with_middleware: bool) -> Starlette:
+    app = Starlette(routes=[Route("/search", search)])
+    if with_middleware:
+        app.add_middleware(CORSMiddlewareNew)
+        app.add_middleware(CSRFMiddlewareNew, exempt_paths={"/multi-search"})
+        app.add_middleware(RequestLoggerMiddleware)
+    return app
+
+
+async def call(app) -> None:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/search", "raw_path": b"/search",
+        "root_path": "", "query_string": b"q=solar", "server": ("backend", 8000),
+        "client": ("127.0.0.1", 5000),
+        "headers": [(b"host", b"backend:8000"), (b"origin", b"https://finder.green")],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app, requests: int) -> float:
+    """Mean microseconds per request"""
+    for _ in range(500):  # warm up
+        await call(app)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    async def run():
+        bare = await measure(build_app(False), args.requests)
+        stacked = await measure(build_app(True), args.requests)
+        print(f"bare /search:           {bare:8.1f} us/request")
+        print(f"with middleware:        {stacked:8.1f} us/request")
+        print(f"middleware overhead:    {stacked - bare:8.1f} us/request")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
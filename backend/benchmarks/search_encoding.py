@@ -0,0 +1,81 @@
+# backend/benchmarks/search_encoding.py
+"""
+Cost of turning a Typesense search response into a /search response body.
+
+    PYTHONPATH=src python benchmarks/search_encoding.py [--hits 250] [--rounds 200]
+
+Builds a Typesense-shaped response with ``--hits`` highlighted hits and times three ways
+of answering with it: decoding and re-encoding with the stdlib (what httpx's
+``response.json()`` and ``JSONResponse`` did), the same round trip with orjson
+(ORJSONResponse), and passing the bytes through untouched (RawJSONResponse).
+"""
+
+import argparse
+import json
+import time
+import orjson
+from starlette.responses import JSONResponse
+from app.responses import ORJSONResponse, RawJSONResponse
+
+
+def typesense_response(hits: int) -> bytes:
+    description = "Open source tooling for tracking and reducing the carbon footprint of software. " * 3
+    return json.dumps({
+        "facet_counts": [
+            {"field_name": "language", "counts": [{"value": f"lang{i}", "count": 100 - i} for i in range(10)]},
+        ],
+        "found": hits * 4,
+        "hits": [{
+            "document": {
+                "id": f"org{i}-repo{i}",
+                "Id-repo": f"org{i}-repo{i}",
+                "name": f"carbon-aware-{i}",
+                "organisation": f"green-software-{i % 20}",
+                "description": description,
+                "url": f"https://github.com/green-software-{i % 20}/carbon-aware-{i}",
+                "language": "Python",
+                "license": "MIT",
+                "latest_update": 1717000000 + i,
+                "open_pull_requests": i % 13,
+                "is_fork": False,
+            },
+            "highlights": [{
+                "field": "description",
+                "matched_tokens": ["carbon"],
+                "snippet": "Open source tooling for tracking and reducing the <mark>carbon</mark> footprint",
+            }],
+            "text_match": 578730123365187705,
+        } for i in range(hits)],
+        "out_of": hits * 40,
+        "page": 1,
+        "request_params": {"collection_name": "ossfinder", "per_page": hits, "q": "carbon"},
+        "search_cutoff": False,
+        "search_time_ms": 4,
+    }).encode("utf-8")
+
+
+def measure(label: str, answer, body: bytes, rounds: int) -> None:
+    for _ in range(10):  # warm up
+        answer(body)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        answer(body)
+    elapsed = (time.perf_counter() - start) / rounds * 1e6
+    print(f"{label:<28} {elapsed:10.1f} us/response")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hits", type=int, default=250)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    body = typesense_response(args.hits)
+    print(f"Typesense response: {len(body) / 1024:.0f} KiB, {args.hits} hits")
+    measure("stdlib decode + encode", lambda raw: JSONResponse(json.loads(raw)), body, args.rounds)
+    measure("orjson decode + encode", lambda raw: ORJSONResponse(orjson.loads(raw)), body, args.rounds)
+    measure("raw pass-through", lambda raw: RawJSONResponse(raw), body, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
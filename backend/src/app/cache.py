@@ -0,0 +1,135 @@
+# backend/src/app/cache.py
+"""
+In-process search result cache.
+
+Entries are keyed on the normalized query plus the search parameters (page, per_page,
+filters, ...) and expire after a TTL; the least recently used entry is evicted once
+the cache is full. Every entry remembers the index generation it was stored under, and
+TypesenseClient bumps the generation after a successful import, so an upload invalidates
+all cached results at once without walking the cache. The same generation and key
+make up the ETag that /search sends, so HTTP caches are invalidated by uploads too.
+/suggest has its own short-lived cache, invalidated the same way.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace so equivalent queries share an entry"""
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """Bounded TTL + LRU cache for search results"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries if max_entries is not None else int(
+            os.getenv('SEARCH_CACHE_MAX_ENTRIES', '1024')
+        )
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            os.getenv('SEARCH_CACHE_TTL_SECONDS', '60')
+        )
+        self.generation = 0
+        # Tells generations of different processes (restarts, workers) apart in ETags
+        self.epoch = format(time.time_ns(), "x")
+        self._entries: "OrderedDict[Tuple, Tuple[float, int, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def make_key(query: str, **params) -> Tuple:
+        """Cache key from the normalized query and the remaining search parameters"""
+        return (normalize_query(query),) + tuple(
+            sorted((name, str(value)) for name, value in params.items() if value is not None)
+        )
+
+    def etag(self, key: Tuple) -> str:
+        """Weak ETag for the results under ``key`` at the current index generation"""
+        digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=8).hexdigest()
+        return f'W/"{self.epoch}.{self.generation}.{digest}"'
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """Return the cached value, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, generation, value = entry
+        if generation != self.generation:
+            del self._entries[key]
+            self.invalidations += 1
+            self.misses += 1
+            return None
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Tuple, value: Any, generation: Optional[int] = None) -> None:
+        """Store ``value``; pass the generation read before fetching it, so a result
+        fetched while an import finished is stored as already stale"""
+        if not self.enabled:
+            return
+
+        generation = self.generation if generation is None else generation
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, generation, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def bump_generation(self) -> int:
+        """Invalidate every cached result, e.g. after new documents were indexed"""
+        self.generation += 1
+        return self.generation
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters"""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+search_cache = SearchCache()
+
+# Search-as-you-type results: many tiny entries that are cheap to get wrong for a few
+# seconds, so a larger cache with a short TTL
+suggest_cache = SearchCache(
+    max_entries=int(os.getenv('SUGGEST_CACHE_MAX_ENTRIES', '4096')),
+    ttl_seconds=float(os.getenv('SUGGEST_CACHE_TTL_SECONDS', '10')),
+)
@@ -0,0 +1,214 @@
+# backend/src/app/jobs.py
+"""
+Background ingestion jobs for /upload?async=1.
+
+Uploads are queued as jobs and drained by a single background worker, which feeds the
+documents to TypesenseClient.index_data in chunks and records progress after each one.
+Job status (progress, throughput, failures and ETA) is kept in memory for GET /jobs/{id}.
+Streamed (NDJSON) uploads are parked in a DocumentSpool, a temporary file read back one
+chunk at a time, so a queued job does not hold the whole payload in memory.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, Iterator, List, Union
+
+logger = logging.getLogger(__name__)
+
+# Errors kept per job; the counters stay exact beyond this
+MAX_JOB_ERRORS = 100
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class DocumentSpool:
+    """Validated documents written to a temporary file as they stream in"""
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile()
+        self.count = 0
+
+    def append(self, document: Dict) -> None:
+        self.file.write(json.dumps(document).encode("utf-8") + b"\n")
+        self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def chunks(self, size: int) -> Iterator[List[Dict]]:
+        self.file.seek(0)
+        chunk = []
+        for line in self.file:
+            chunk.append(json.loads(line))
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _chunks(documents: Union[List[Dict], DocumentSpool], size: int) -> Iterator[List[Dict]]:
+    if isinstance(documents, DocumentSpool):
+        yield from documents.chunks(size)
+    else:
+        for start in range(0, len(documents), size):
+            yield documents[start:start + size]
+
+
+class IngestionJob:
+    """A queued upload and its progress"""
+
+    def __init__(self, documents: Union[List[Dict], DocumentSpool], action: str, batch_size: int):
+        self.id = uuid.uuid4().hex
+        self.documents = documents
+        self.action = action
+        self.batch_size = batch_size
+        self.status = "queued"
+        self.total = len(documents)
+        self.processed = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def record(self, summary: Dict[str, Any]) -> None:
+        """Fold an index_data summary for one chunk into the job counters"""
+        self.processed += summary["total"]
+        self.imported += summary["imported"]
+        self.failed += summary["failed"]
+        room = MAX_JOB_ERRORS - len(self.errors)
+        if room > 0:
+            self.errors.extend(summary["errors"][:room])
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = None
+        throughput = None
+        eta = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+            if elapsed > 0 and self.processed:
+                throughput = self.processed / elapsed
+                if self.status == "running":
+                    eta = (self.total - self.processed) / throughput
+
+        return {
+            "id": self.id,
+            "status": self.status,
+            "action": self.action,
+            "total": self.total,
+            "processed": self.processed,
+            "imported": self.imported,
+            "failed": self.failed,
+            "progress": self.processed / self.total if self.total else 1.0,
+            "throughput_docs_per_second": round(throughput, 2) if throughput is not None else None,
+            "eta_seconds": round(eta, 2) if eta is not None else None,
+            "elapsed_seconds": round(elapsed, 3) if elapsed is not None else None,
+            "created_at": _isoformat(self.created_at),
+            "started_at": _isoformat(self.started_at),
+            "finished_at": _isoformat(self.finished_at),
+            "errors": self.errors,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """Queue of ingestion jobs drained by one background worker task"""
+
+    def __init__(self, max_jobs: Optional[int] = None):
+        self.max_jobs = max_jobs or int(os.getenv('INGEST_JOB_HISTORY', '100'))
+        self.jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self, client) -> None:
+        """Start the worker on the running loop if it is not already running there"""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            for job in self.jobs.values():
+                if job.status == "queued":
+                    self._queue.put_nowait(job)
+            self._worker = loop.create_task(self._run(client))
+
+    def submit(self, client, documents: Union[List[Dict], DocumentSpool], action: str, batch_size: int) -> IngestionJob:
+        """Queue documents for indexing and return the job tracking them"""
+        job = IngestionJob(documents, action, batch_size)
+        self.jobs[job.id] = job
+        self._evict()
+        self._ensure_worker(client)
+        self._queue.put_nowait(job)
+        logger.info(f"Queued ingestion job {job.id} with {job.total} documents")
+        return job
+
+    async def stop(self) -> None:
+        """Cancel the worker; jobs still queued are kept but not processed"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        return self.jobs.get(job_id)
+
+    def _evict(self) -> None:
+        """Drop the oldest finished jobs once the history is full"""
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= self.max_jobs:
+                break
+            if self.jobs[job_id].status in ("completed", "failed"):
+                del self.jobs[job_id]
+
+    async def _run(self, client) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._process(client, job)
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, client, job: IngestionJob) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        # Each chunk keeps every import slot of the client busy
+        chunk_size = job.batch_size * client.IMPORT_CONCURRENCY
+        try:
+            for chunk in _chunks(job.documents, chunk_size):
+                summary = await client.index_data(chunk, action=job.action, batch_size=job.batch_size)
+                job.record(summary)
+            job.status = "completed"
+        except Exception as e:
+            logger.error(f"Ingestion job {job.id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            if isinstance(job.documents, DocumentSpool):
+                job.documents.close()
+            job.documents = []  # Release the payload once the job is done
+            logger.info(
+                f"Ingestion job {job.id} {job.status}: "
+                f"{job.imported}/{job.total} imported, {job.failed} failed"
+            )
+
+
+job_manager = JobManager()
@@ -1,22 +1,31 @@
 # backend/src/app/main.py
 import os
+import math
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 from starlette.applications import Starlette
 from starlette.routing import Route, Mount
 from starlette.responses import JSONResponse
+from typesense.exceptions import ObjectUnprocessable, RequestMalformed, ServiceUnavailable, Timeout
 from starlette.staticfiles import StaticFiles
 
 # Relative routes
 from .middleware.security import CORSMiddlewareNew, CSRFMiddlewareNew
 from .middleware.logging import RequestLoggerMiddleware
+from .logging_config import setup_logging
 from .typesense_client import get_typesense_client
-from .routes.search import search
+from .cache import search_cache, suggest_cache
+from .metrics import metrics
+from .jobs import job_manager
+from .resilience import CircuitOpenError
+from .routes.search import search, multi_search, suggest
 from .routes.upload import upload
+from .routes.jobs import job_status
 
 # Initialize logging
-logging.basicConfig(level=logging.DEBUG)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Environment setup
@@ -54,26 +63,53 @@ static_dir.mkdir(exist_ok=True)
 async def health_check(request):
     try:
         client = get_typesense_client()
-        health_data = client.health()
+        health_data = await client.health()
         return JSONResponse({
             "status": "healthy" if health_data.get('ok') else "degraded",
             "services": {
                 "typesense": health_data,
                 "api": True
-            }
+            },
+            "cache": search_cache.stats(),
+            "suggest_cache": suggest_cache.stats()
         }, status_code=200 if health_data.get('ok') else 503)
     except Exception as e:
         logger.error(f"Health check error: {str(e)}")
         return JSONResponse({"status": "unhealthy"}, status_code=500)
 
+async def readiness_check(request):
+    """Whether the Typesense collection has been verified"""
+    ready = get_typesense_client().ready
+    return JSONResponse({"ready": ready}, status_code=200 if ready else 503)
+
+async def typesense_unavailable(request, exc):
+    """Fail fast with 503 while Typesense is down or the circuit is open"""
+    headers = {}
+    if isinstance(exc, CircuitOpenError):
+        headers["Retry-After"] = str(max(1, math.ceil(exc.retry_after)))
+    return JSONResponse({"error": "Search service unavailable"}, status_code=503, headers=headers)
+
+async def typesense_timeout(request, exc):
+    return JSONResponse({"error": "Search service timed out"}, status_code=504)
+
+async def typesense_rejected(request, exc):
+    """Typesense refused the request (e.g. a malformed filter_by or sort_by): the client's fault"""
+    message = str(exc).split("] ", 1)[-1]
+    return JSONResponse({"error": f"Invalid search request: {message}"}, status_code=400)
+
 async def root(request):
     return JSONResponse({
         "message": "Backend API",
         "endpoints": {
             "/": "GET - API documentation",
             "/health": "GET - Service health",
+            "/ready": "GET - Readiness (collection verified)",
+            "/metrics": "GET - Prometheus metrics",
             "/search": "GET - Search endpoint",
-            "/upload": "POST - Upload endpoint",
+            "/suggest": "GET - Search-as-you-type suggestions (?q=prefix&limit=5)",
+            "/multi-search": "POST - Several searches in one round trip",
+            "/upload": "POST - Upload endpoint (?async=1 queues an ingestion job)",
+            "/jobs/{id}": "GET - Ingestion job status",
             "/contact": "POST - Contact form",
             "/static": "GET - Static files"
         }
@@ -82,20 +118,42 @@ async def root(request):
 routes = [
     Route("/", root),
     Route("/health", health_check, methods=["GET"]),
+    Route("/ready", readiness_check, methods=["GET"]),
+    Route("/metrics", metrics, methods=["GET"]),
     Route("/search", search, methods=["GET"]),
+    Route("/suggest", suggest, methods=["GET"]),
+    Route("/multi-search", multi_search, methods=["POST"]),
     Route("/upload", upload, methods=["POST"]),
+    Route("/jobs/{job_id}", job_status, methods=["GET"]),
 ]
 
 if static_dir.exists():
     routes.append(Mount("/static", StaticFiles(directory=static_dir)))
 
+@asynccontextmanager
+async def lifespan(app):
+    """Create the one shared Typesense client and verify the collection without blocking boot"""
+    client = get_typesense_client()
+    await client.startup()
+    yield
+    await job_manager.stop()
+    await client.aclose()
+
 app = Starlette(
     debug=config["DEBUG"],
     routes=routes,
+    lifespan=lifespan,
+    exception_handlers={
+        ServiceUnavailable: typesense_unavailable,
+        Timeout: typesense_timeout,
+        RequestMalformed: typesense_rejected,
+        ObjectUnprocessable: typesense_rejected,
+    },
 )
 
 app.add_middleware(CORSMiddlewareNew)
-app.add_middleware(CSRFMiddlewareNew)
+# /multi-search is a read-only POST called server-side by the frontend
+app.add_middleware(CSRFMiddlewareNew, exempt_paths={"/multi-search"})
 app.add_middleware(RequestLoggerMiddleware)
 
 if __name__ == "__main__":
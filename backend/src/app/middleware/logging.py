@@ -1,45 +1,83 @@
 # backend/src/app/middleware/logging.py
 import logging
-from starlette.types import ASGIApp
-from starlette.requests import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+import random
+import time
+from typing import Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..logging_config import ACCESS_SAMPLE_RATE, Payload
+from ..metrics import REQUESTS_IN_FLIGHT, observe_request, route_label
 
 # Initialize logger at module level
 logger = logging.getLogger(__name__)
 
-class RequestLoggerMiddleware(BaseHTTPMiddleware):
+# Query strings are logged as-is, cut to this length
+MAX_QUERY_CHARS = 256
+
+class RequestLoggerMiddleware:
     """
     Middleware for logging HTTP requests and responses.
-    Logs the incoming request method/path and response status code.
+    Logs the incoming request method/path and response status code for a sample of
+    requests (``LOG_ACCESS_SAMPLE_RATE``); server errors are always logged. Every
+    request is also counted in the request latency and in-flight metrics, and its
+    response carries the time to the response headers as Server-Timing ``total``.
     """
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-
-    async def dispatch(self, request: Request, call_next):
-        # Log incoming request
-        logger.info(
-            "Request: %s %s",
-            request.method,
-            request.url.path,
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "query": dict(request.query_params)
-            }
-        )
+    def __init__(self, app: ASGIApp, sample_rate: Optional[float] = None):
+        self.app = app
+        self.sample_rate = ACCESS_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        response = await call_next(request)
-
-        # Log response
-        logger.info(
-            "Response: %d %s",
-            response.status_code,
-            request.url.path,
-            extra={
-                "status": response.status_code,
-                "path": request.url.path,
-                "method": request.method
-            }
+        started = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        status = 500
+        sampled = logger.isEnabledFor(logging.INFO) and (
+            self.sample_rate >= 1 or random.random() < self.sample_rate
         )
 
-        return response
\ No newline at end of file
+        if sampled:
+            # Log incoming request
+            logger.info(
+                "Request: %s %s",
+                method,
+                path,
+                extra={
+                    "method": method,
+                    "path": path,
+                    "query": Payload(scope["query_string"].decode("latin-1"), MAX_QUERY_CHARS)
+                }
+            )
+
+        async def send_with_logging(message: Message) -> None:
+            nonlocal status
+            if message["type"] != "http.response.start":
+                await send(message)
+                return
+            status = message["status"]
+            MutableHeaders(scope=message).append(
+                "server-timing", f"total;dur={(time.perf_counter() - started) * 1000:.1f}"
+            )
+            if sampled or (status >= 500 and logger.isEnabledFor(logging.INFO)):
+                # Log response
+                logger.info(
+                    "Response: %d %s",
+                    message["status"],
+                    path,
+                    extra={
+                        "status": message["status"],
+                        "path": path,
+                        "method": method
+                    }
+                )
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_logging)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            observe_request(method, route_label(scope), status, started)
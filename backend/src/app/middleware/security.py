@@ -1,87 +1,135 @@
 # backend/src/app/middleware/security.py
-from starlette.middleware.base import BaseHTTPMiddleware
+"""
+CORS and CSRF middleware as plain ASGI apps.
+
+Both read their configuration (DEBUG, allowed origins, cookie settings) once when the
+app is built instead of on every request, and only touch the response start message,
+so responses stream straight through.
+"""
+
+from http.cookies import SimpleCookie
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.requests import Request
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from itsdangerous import URLSafeTimedSerializer
 from itsdangerous.exc import BadSignature, SignatureExpired
 import time
 import os
 
-
-class CORSMiddlewareNew(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next) -> Response:
-        response = await call_next(request) if request.method != "OPTIONS" else Response()
-
-        # Auto-configure allowed origins
-        is_dev = os.getenv('DEBUG', 'false').lower() in ('true', '1', 't')
-        origin = request.headers.get('origin')
-
-        # Development: Allow common dev origins + local network
-        if is_dev:
-            dev_origins = [
-                'http://localhost:8080',
-                'http://127.0.0.1:8001',
-                'http://localhost:8001',
-                'http://0.0.0.0:8001',
-                'http://backend:8000'  # Docker internal
-            ]
-            if origin in dev_origins or not origin:
-                response.headers['Access-Control-Allow-Origin'] = origin or '*'
-
-        # Production: Strict origin check
-        else:
-            prod_origins = [
-                'https://finder.green',
-                'https://www.finder.green',
-                'http://backend:8000' # Direct backend access
-            ]
-            if origin in prod_origins:
-                response.headers['Access-Control-Allow-Origin'] = origin
-
-        # Common headers
-        if 'Access-Control-Allow-Origin' in response.headers:
-            response.headers.update({
-                'Access-Control-Allow-Credentials': 'true',
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type, X-CSRF-Token, Origin, X-CSRFToken',
-                'Access-Control-Max-Age': '600'
-            })
-
-        return response
-
-
-class CSRFMiddlewareNew(BaseHTTPMiddleware):
-    def __init__(self, app, secret_key=None, cookie_name='csrftoken', safe_methods=None):
-        super().__init__(app)
+DEV_ORIGINS = frozenset({
+    'http://localhost:8080',
+    'http://127.0.0.1:8001',
+    'http://localhost:8001',
+    'http://0.0.0.0:8001',
+    'http://backend:8000'  # Docker internal
+})
+
+PROD_ORIGINS = frozenset({
+    'https://finder.green',
+    'https://www.finder.green',
+    'http://backend:8000'  # Direct backend access
+})
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Credentials': 'true',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, X-CSRF-Token, Origin, X-CSRFToken',
+    'Access-Control-Max-Age': '600'
+}
+
+FORM_CONTENT_TYPES = ('application/x-www-form-urlencoded', 'multipart/form-data')
+
+
+def debug_enabled() -> bool:
+    return os.getenv('DEBUG', 'false').lower() in ('true', '1', 't')
+
+
+class CORSMiddlewareNew:
+    def __init__(self, app: ASGIApp, debug=None):
+        self.app = app
+        self.debug = debug_enabled() if debug is None else debug
+        self.allowed_origins = DEV_ORIGINS if self.debug else PROD_ORIGINS
+
+    def allow_origin(self, origin):
+        """Value for Access-Control-Allow-Origin, or None to leave CORS headers off"""
+        if origin in self.allowed_origins:
+            return origin
+        # Development also allows requests without an Origin (curl, server-side calls)
+        if self.debug and not origin:
+            return '*'
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        allow_origin = self.allow_origin(Headers(scope=scope).get('origin'))
+
+        if scope['method'] == 'OPTIONS':
+            response = Response()
+            if allow_origin:
+                response.headers.update({'Access-Control-Allow-Origin': allow_origin, **CORS_HEADERS})
+            await response(scope, receive, send)
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                headers = MutableHeaders(scope=message)
+                # The CORS headers depend on the Origin, which shared caches must key on
+                headers.add_vary_header('Origin')
+                if allow_origin is not None:
+                    headers['Access-Control-Allow-Origin'] = allow_origin
+                    for name, value in CORS_HEADERS.items():
+                        headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
+class CSRFMiddlewareNew:
+    def __init__(self, app, secret_key=None, cookie_name='csrftoken', safe_methods=None, exempt_paths=None,
+                 debug=None):
+        self.app = app
         self.secret_key = secret_key or os.getenv("CSRF_SECRET_KEY")
         self.cookie_name = cookie_name
-        self.safe_methods = safe_methods or {'GET', 'HEAD', 'OPTIONS', 'TRACE'}
-        self.serializer = URLSafeTimedSerializer(self.secret_key)
+        self.safe_methods = frozenset(safe_methods or {'GET', 'HEAD', 'OPTIONS', 'TRACE'})
+        self.exempt_paths = frozenset(exempt_paths or ())
+        self.debug = debug_enabled() if debug is None else debug
 
         if not self.secret_key:
             raise ValueError("CSRF_SECRET_KEY must be set in environment")
+        self.serializer = URLSafeTimedSerializer(self.secret_key)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next):
         # Skip CSRF checks for development if DEBUG=True
-        if os.getenv("DEBUG", "false").lower() in ('true', '1', 't'):
-            response = await call_next(request)
-            self._set_csrf_cookie(response)
-            return response
-
-        # Skip CSRF checks for safe methods
-        if request.method in self.safe_methods:
-            return await call_next(request)
-
-        # Get tokens from header or form data
-        csrf_token = (
-                request.headers.get('X-CSRF-Token') or
-                (await request.form()).get('csrf_token') or
-                request.query_params.get('csrf_token')
-        )
+        if self.debug:
+            await self.app(scope, receive, self._send_with_cookie(send))
+            return
+
+        # Skip CSRF checks for safe methods and read-only POST endpoints
+        if scope['method'] in self.safe_methods or scope['path'] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive)
+        csrf_token = request.headers.get('X-CSRF-Token')
+        if not csrf_token and request.headers.get('content-type', '').startswith(FORM_CONTENT_TYPES):
+            # The form has to be read to find the token; replay the body for the endpoint
+            body = await request.body()
+            csrf_token = (await request.form()).get('csrf_token')
+            receive = self._replay(body, receive)
+        csrf_token = csrf_token or request.query_params.get('csrf_token')
         cookie_token = request.cookies.get(self.cookie_name)
 
         if not csrf_token or not cookie_token:
-            return Response('CSRF token missing', status_code=403)
+            await Response('CSRF token missing', status_code=403)(scope, receive, send)
+            return
 
         try:
             cookie_data = self.serializer.loads(cookie_token, max_age=3600)
@@ -91,25 +139,43 @@ class CSRFMiddlewareNew(BaseHTTPMiddleware):
                 raise ValueError("Tokens don't match")
 
         except (BadSignature, SignatureExpired, ValueError) as e:
-            return Response(f'Invalid CSRF token: {str(e)}', status_code=403)
-
-        response = await call_next(request)
-        self._set_csrf_cookie(response)
-        return response
-
-    def _set_csrf_cookie(self, response):
-        """Sets CSRF cookie with domain handling for prod/dev"""
-        cookie_kwargs = {
-            'key': self.cookie_name,
-            'value': self.serializer.dumps(str(time.time())),
-            'httponly': True,
-            'samesite': 'lax',
-            'secure': not os.getenv("DEBUG", "false").lower() in ('true', '1', 't'),
-            'max_age': 3600
-        }
-
-        # Only set domain in production
-        if not os.getenv("DEBUG", "false").lower() in ('true', '1', 't'):
-            cookie_kwargs['domain'] = ".finder.green"
-
-        response.set_cookie(**cookie_kwargs)
+            await Response(f'Invalid CSRF token: {str(e)}', status_code=403)(scope, receive, send)
+            return
+
+        await self.app(scope, receive, self._send_with_cookie(send))
+
+    @staticmethod
+    def _replay(body: bytes, receive: Receive) -> Receive:
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            return await receive()
+
+        return replay
+
+    def _send_with_cookie(self, send: Send) -> Send:
+        async def send_with_cookie(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                MutableHeaders(scope=message).append('set-cookie', self._csrf_cookie())
+            await send(message)
+
+        return send_with_cookie
+
+    def _csrf_cookie(self) -> str:
+        """Set-Cookie value for a fresh CSRF token, with domain handling for prod/dev"""
+        cookie = SimpleCookie()
+        cookie[self.cookie_name] = self.serializer.dumps(str(time.time()))
+        morsel = cookie[self.cookie_name]
+        morsel['max-age'] = 3600
+        morsel['path'] = '/'
+        morsel['httponly'] = True
+        morsel['samesite'] = 'lax'
+        if not self.debug:
+            morsel['secure'] = True
+            # Only set domain in production
+            morsel['domain'] = ".finder.green"
+        return cookie.output(header='').strip()
@@ -0,0 +1,158 @@
+# backend/src/app/migrate.py
+"""
+Migrate the ossfinder collection to the typed schema.
+
+    python -m app.migrate [--batch-size 5000] [--keep-old] [--force]
+
+Creates a new `ossfinder_<timestamp>` collection with the typed schema, bulk-copies every
+document from the live collection (exported as JSONL and coerced field by field), points
+the `ossfinder` alias at the new collection and drops the old one. Restart the backend
+afterwards so its cached field types match the new schema and its search ETags and
+caches start a new epoch, and purge the nginx search cache (see the README).
+
+The first migration of a plain `ossfinder` collection has a short outage: Typesense
+cannot alias a name that a collection still holds, so the old collection is dropped
+before the alias is created, and searches fail in between. The copy's document count
+is checked before anything is dropped, and the alias PUT is retried. If it still fails,
+the data is safe in the new collection, and the error says how to create the alias by
+hand. Later migrations only move the alias and have no outage.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import AsyncIterator, Dict, Optional
+from typesense.exceptions import ObjectNotFound, TypesenseClientError
+from .logging_config import setup_logging
+from .schema import COLLECTION_NAME, coerce_document, collection_schema
+from .typesense_client import TypesenseClient
+
+logger = logging.getLogger(__name__)
+
+# Attempts at pointing the alias at the new collection, with doubling delays in between
+ALIAS_ATTEMPTS = 5
+ALIAS_RETRY_SECONDS = 0.5
+
+
+async def resolve_collection(client: TypesenseClient, name: str = COLLECTION_NAME) -> Optional[str]:
+    """Collection an alias points at, or None if `name` is not an alias"""
+    try:
+        response = await client._request('GET', f'/aliases/{name}')
+        return response.json()['collection_name']
+    except ObjectNotFound:
+        return None
+
+
+async def export_documents(client: TypesenseClient, collection: str) -> AsyncIterator[Dict]:
+    """Stream the documents of a collection from the JSONL export endpoint"""
+    async with client.client.stream('GET', f'/collections/{collection}/documents/export') as response:
+        if response.status_code >= 400:
+            await response.aread()
+            raise TypesenseClientError(f"[Errno {response.status_code}] Export failed: {response.text}")
+        async for line in response.aiter_lines():
+            if line:
+                yield json.loads(line)
+
+
+async def point_alias(client: TypesenseClient, target: str) -> None:
+    """Point the alias at ``target``, retrying transient errors; the name may be unserved until it succeeds"""
+    for attempt in range(1, ALIAS_ATTEMPTS + 1):
+        try:
+            await client._request('PUT', f'/aliases/{COLLECTION_NAME}', json={'collection_name': target})
+            return
+        except TypesenseClientError as e:
+            if attempt == ALIAS_ATTEMPTS:
+                raise RuntimeError(
+                    f"Could not point alias '{COLLECTION_NAME}' at '{target}' ({e}); searches fail until it "
+                    f"exists. The documents are in '{target}': PUT /aliases/{COLLECTION_NAME} with "
+                    f'{{"collection_name": "{target}"}} to finish the migration.'
+                ) from e
+            logger.warning(f"Pointing alias '{COLLECTION_NAME}' at '{target}' failed ({e!r}), retrying")
+            await asyncio.sleep(ALIAS_RETRY_SECONDS * 2 ** (attempt - 1))
+
+
+async def migrate(
+    client: TypesenseClient,
+    batch_size: int = 5000,
+    keep_old: bool = False,
+    force: bool = False,
+) -> Dict:
+    """Copy the live collection into a typed collection and swap the alias over.
+
+    If any document fails to copy the swap is skipped (unless ``force``), leaving the
+    live collection untouched and the new one in place for inspection.
+    """
+    alias_target = await resolve_collection(client)
+    source = alias_target or COLLECTION_NAME
+    target = f"{COLLECTION_NAME}_{int(time.time())}"
+
+    await client._request('POST', '/collections', json=collection_schema(target))
+    logger.info(f"Created collection '{target}', copying documents from '{source}'")
+
+    summary = client._new_summary("create")
+    batch = []
+    async for document in export_documents(client, source):
+        batch.append(coerce_document(document))
+        if len(batch) >= batch_size:
+            client._record_batch(summary, batch, await client._import_batch(batch, "create", target))
+            logger.info(f"Copied {summary['total']} documents ({summary['failed']} failed)")
+            batch = []
+    if batch:
+        client._record_batch(summary, batch, await client._import_batch(batch, "create", target))
+
+    if summary["failed"] and not force:
+        raise RuntimeError(
+            f"{summary['failed']} of {summary['total']} documents failed to copy into '{target}'; "
+            f"'{source}' is still live. First error: {summary['errors'][0]['error']}"
+        )
+
+    copied = (await client._request('GET', f'/collections/{target}')).json().get('num_documents')
+    if copied != summary["imported"] and not force:
+        raise RuntimeError(
+            f"'{target}' holds {copied} documents but {summary['imported']} were imported; "
+            f"'{source}' is still live"
+        )
+
+    if alias_target is None:
+        # A concrete collection holds the name the alias needs, so it has to go first;
+        # searches fail from here until the alias exists
+        await client._request('DELETE', f'/collections/{source}')
+        logger.info(f"Dropped collection '{source}'")
+    await point_alias(client, target)
+    logger.info(f"Alias '{COLLECTION_NAME}' now points at '{target}'")
+
+    if alias_target is not None and not keep_old:
+        await client._request('DELETE', f'/collections/{source}')
+        logger.info(f"Dropped collection '{source}'")
+
+    return {"source": source, "target": target, **summary}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate the ossfinder collection to the typed schema")
+    parser.add_argument("--batch-size", type=int, default=5000, help="documents per import request")
+    parser.add_argument("--keep-old", action="store_true",
+                        help="keep the previous collection when it was behind the alias")
+    parser.add_argument("--force", action="store_true",
+                        help="swap the alias even if some documents failed to copy")
+    args = parser.parse_args()
+    setup_logging()
+
+    async def run():
+        client = TypesenseClient()
+        try:
+            return await migrate(client, batch_size=args.batch_size, keep_old=args.keep_old, force=args.force)
+        finally:
+            await client.aclose()
+
+    summary = asyncio.run(run())
+    errors = summary.pop("errors")
+    print(json.dumps(summary, indent=2))
+    for error in errors[:20]:
+        print(f"  {error['id']}: {error['error']}")
+
+
+if __name__ == "__main__":
+    main()
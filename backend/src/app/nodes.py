@@ -0,0 +1,123 @@
+# backend/src/app/nodes.py
+"""
+Typesense cluster nodes and health-aware request routing.
+
+Reads go to the nearest node while it is healthy and are otherwise spread round-robin
+over the healthy replicas; writes go to the current leader (found through GET /debug)
+and fall back to any healthy node, which Typesense forwards to the leader. Every node
+has its own circuit breaker, and the latency and error rate observed per node are kept
+as exponentially weighted moving averages.
+"""
+
+import itertools
+import os
+from typing import Dict, List, Optional, Any
+from .resilience import CircuitBreaker, CircuitOpenError
+
+# Weight of the newest sample in the moving averages
+EWMA_ALPHA = 0.2
+
+
+def parse_node_urls(value: str) -> List[str]:
+    """Node base URLs from a comma-separated list, without trailing slashes"""
+    return [url.strip().rstrip("/") for url in value.split(",") if url.strip()]
+
+
+class Node:
+    """One Typesense node and what we have observed about it"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.breaker = CircuitBreaker()
+        self.is_leader = False
+        self.requests = 0
+        self.errors = 0
+        self.latency_ms: Optional[float] = None
+        self.error_rate = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        """Closed circuit and no failure since the last success"""
+        return self.breaker.state == CircuitBreaker.CLOSED and self.breaker.failures == 0
+
+    def available(self) -> bool:
+        """Whether the breaker would let a request through right now"""
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            return False
+        return True
+
+    def _observe(self, latency_ms: Optional[float], failed: bool) -> None:
+        self.requests += 1
+        if latency_ms is not None:
+            self.latency_ms = latency_ms if self.latency_ms is None else (
+                EWMA_ALPHA * latency_ms + (1 - EWMA_ALPHA) * self.latency_ms
+            )
+        self.error_rate = EWMA_ALPHA * float(failed) + (1 - EWMA_ALPHA) * self.error_rate
+
+    def record_success(self, latency_ms: float) -> None:
+        self._observe(latency_ms, False)
+        self.breaker.record_success()
+
+    def record_failure(self, latency_ms: Optional[float] = None) -> None:
+        self.errors += 1
+        self._observe(latency_ms, True)
+        self.breaker.record_failure()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "leader": self.is_leader,
+            "circuit": self.breaker.state,
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "latency_ms": round(self.latency_ms, 2) if self.latency_ms is not None else None,
+        }
+
+
+class NodePool:
+    """The configured nodes, with read/write selection"""
+
+    def __init__(self, urls: List[str], nearest_url: Optional[str] = None):
+        if nearest_url and nearest_url not in urls:
+            urls = [nearest_url] + urls
+        if not urls:
+            raise ValueError("At least one Typesense node is required")
+        self.nodes = [Node(url) for url in urls]
+        self.nearest = next((node for node in self.nodes if node.url == nearest_url), None)
+        self._round_robin = itertools.count()
+        if len(self.nodes) == 1:
+            self.nodes[0].is_leader = True
+
+    @classmethod
+    def from_env(cls, protocol: str, host: str, port: str) -> "NodePool":
+        """TYPESENSE_NODES (comma-separated URLs) or the single TYPESENSE_HOST/PORT node"""
+        urls = parse_node_urls(os.getenv('TYPESENSE_NODES', '')) or [f"{protocol}://{host}:{port}"]
+        nearest = os.getenv('TYPESENSE_NEAREST_NODE', '').strip().rstrip("/") or None
+        return cls(urls, nearest)
+
+    @property
+    def leader(self) -> Optional[Node]:
+        return next((node for node in self.nodes if node.is_leader), None)
+
+    def set_leader(self, leader: Optional[Node]) -> None:
+        for node in self.nodes:
+            node.is_leader = node is leader
+
+    def select(self, write: bool = False) -> Node:
+        """Pick the node for a request, or raise CircuitOpenError if none is available"""
+        preferred = self.leader if write else self.nearest
+        if preferred is not None and preferred.healthy:
+            return preferred
+        # Round-robin over the healthy nodes first, then over any the breakers let through
+        start = next(self._round_robin) % len(self.nodes)
+        candidates = self.nodes[start:] + self.nodes[:start]
+        for node in [node for node in candidates if node.healthy] + candidates:
+            if node.available():
+                return node
+        raise CircuitOpenError(min(node.breaker.reset_timeout for node in self.nodes))
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [node.stats() for node in self.nodes]
@@ -0,0 +1,112 @@
+# backend/src/app/resilience.py
+"""
+Retry policy and circuit breaker for Typesense calls.
+
+Only errors that can succeed on a second try (unavailable, server errors, timeouts) are
+retried, with exponential backoff and full jitter. The circuit breaker opens after a run
+of consecutive failures so requests fail fast with 503 while Typesense is down, and lets
+a single probe through once the reset timeout has passed (half-open).
+"""
+
+import logging
+import os
+import random
+import time
+from typing import Optional
+from typesense.exceptions import (
+    HTTPStatus0Error,
+    ServerError,
+    ServiceUnavailable,
+    Timeout,
+)
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_ERRORS = (ServiceUnavailable, ServerError, Timeout, HTTPStatus0Error)
+
+
+class CircuitOpenError(ServiceUnavailable):
+    """Raised without calling Typesense while the circuit is open"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Typesense circuit open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for retryable errors"""
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+    ):
+        self.max_attempts = max_attempts or int(os.getenv('TYPESENSE_RETRY_ATTEMPTS', '3'))
+        self.base_delay = base_delay if base_delay is not None else float(
+            os.getenv('TYPESENSE_RETRY_BASE_DELAY', '0.1')
+        )
+        self.max_delay = max_delay if max_delay is not None else float(
+            os.getenv('TYPESENSE_RETRY_MAX_DELAY', '2')
+        )
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        return isinstance(error, RETRYABLE_ERRORS)
+
+    def delay(self, attempt: int) -> float:
+        """Sleep before retry number ``attempt`` (1-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failure_threshold`` consecutive failures -> half-open after ``reset_timeout``"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        self.failure_threshold = failure_threshold or int(os.getenv('TYPESENSE_BREAKER_THRESHOLD', '5'))
+        self.reset_timeout = reset_timeout if reset_timeout is not None else float(
+            os.getenv('TYPESENSE_BREAKER_RESET_SECONDS', '10')
+        )
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through right now"""
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            retry_after = self._opened_at + self.reset_timeout - now
+            if retry_after > 0:
+                raise CircuitOpenError(retry_after)
+            self.state = self.HALF_OPEN
+            logger.info("Typesense circuit half-open, probing")
+
+        if self.state == self.HALF_OPEN:
+            # One probe at a time; a probe that never reported back is replaced after reset_timeout
+            if self._probe_started_at is not None and now - self._probe_started_at < self.reset_timeout:
+                raise CircuitOpenError(self._probe_started_at + self.reset_timeout - now)
+            self._probe_started_at = now
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info("Typesense circuit closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_started_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Typesense circuit open after {self.failures} consecutive failures")
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_started_at = None
+
+    def stats(self):
+        return {"state": self.state, "consecutive_failures": self.failures}
@@ -0,0 +1,19 @@
+# backend/src/app/responses.py
+"""
+JSON responses without the stdlib encoder.
+
+RawJSONResponse sends bytes that already are JSON (a Typesense response body) as-is;
+ORJSONResponse encodes with orjson when the content had to be built or changed.
+"""
+
+import orjson
+from starlette.responses import JSONResponse, Response
+
+
+class RawJSONResponse(Response):
+    media_type = "application/json"
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
@@ -0,0 +1,11 @@
+# backend/src/app/routes/jobs.py
+from starlette.responses import JSONResponse
+from starlette.requests import Request
+from ..jobs import job_manager
+
+
+async def job_status(request: Request):
+    job = job_manager.get(request.path_params["job_id"])
+    if job is None:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    return JSONResponse(job.to_dict())
@@ -1,11 +1,116 @@
 # backend/src/app/routes/search.py
-from starlette.responses import JSONResponse
+import json
+import os
+from typing import Any, Dict, Mapping
+from starlette.responses import JSONResponse, Response
 from starlette.requests import Request
-from ..typesense_client import TypesenseClient
+from ..typesense_client import get_typesense_client, SEARCH_OPTIONS
+from ..schema import FACET_FIELDS
+from ..timing import start_timing
+from ..responses import ORJSONResponse, RawJSONResponse
+
+# Upper bound on the number of searches in one /multi-search request
+MAX_MULTI_SEARCHES = int(os.getenv('MULTI_SEARCH_MAX_SEARCHES', '10'))
+
+# How long browsers and the nginx proxy cache may reuse a /search response, and how much
+# longer they may serve it stale while revalidating it with If-None-Match
+SEARCH_CACHE_CONTROL = "public, max-age={}, stale-while-revalidate={}".format(
+    int(os.getenv('SEARCH_HTTP_MAX_AGE', '30')),
+    int(os.getenv('SEARCH_HTTP_STALE_WHILE_REVALIDATE', '60')),
+)
+
+SUGGEST_CACHE_CONTROL = "public, max-age={}".format(int(os.getenv('SUGGEST_HTTP_MAX_AGE', '30')))
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def parse_search(params: Mapping[str, Any]) -> Dict[str, Any]:
+    """Validate one search's parameters (query string or JSON object) into search() kwargs"""
+    try:
+        page = int(params.get("page", 1))
+        per_page = int(params["per_page"]) if params.get("per_page") is not None else None
+    except (TypeError, ValueError):
+        raise ValueError("page and per_page must be integers")
+    if page < 1 or (per_page is not None and per_page < 1):
+        raise ValueError("page and per_page must be positive")
+
+    options = {name: params[name] for name in SEARCH_OPTIONS if name in params}
+    if options.get("facet_by"):
+        unknown = {name.strip() for name in str(options["facet_by"]).split(",")} - set(FACET_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot facet by {sorted(unknown)}, expected {list(FACET_FIELDS)}")
+
+    return {"q": str(params.get("q", "")), "page": page, "per_page": per_page, **options}
 
-typesense_client = TypesenseClient()
 
 async def search(request: Request):
-    query = request.query_params.get("q", "")
-    results = typesense_client.search(query)
-    return JSONResponse(results)
+    """Search, passing Typesense's response body through untouched.
+
+    Responses carry an ETag for the normalized query at the current index generation
+    and are answered with 304 when the client already has them. A Server-Timing
+    header breaks down where the time went.
+    """
+    timing = start_timing()
+    with timing.measure("app"):
+        try:
+            params = parse_search(request.query_params)
+            query = params.pop("q")
+            client = get_typesense_client()
+            etag = client.search_etag(query, **params)
+            if etag_matches(request.headers.get("if-none-match", ""), etag):
+                response = Response(status_code=304)
+            else:
+                response = RawJSONResponse(await client.search_raw(query, **params))
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = SEARCH_CACHE_CONTROL
+    response.headers["Server-Timing"] = timing.header()
+    return response
+
+
+async def suggest(request: Request):
+    """Search-as-you-type suggestions for a prefix of a project or organisation name"""
+    timing = start_timing()
+    with timing.measure("app"):
+        try:
+            limit = int(request.query_params["limit"]) if request.query_params.get("limit") else None
+        except ValueError:
+            return JSONResponse({"error": "limit must be an integer"}, status_code=400)
+        if limit is not None and limit < 1:
+            return JSONResponse({"error": "limit must be positive"}, status_code=400)
+        response = RawJSONResponse(await get_typesense_client().suggest(request.query_params.get("q", ""), limit))
+    response.headers["Cache-Control"] = SUGGEST_CACHE_CONTROL
+    response.headers["Server-Timing"] = timing.header()
+    return response
+
+
+async def multi_search(request: Request):
+    """Run a list of searches in one Typesense round trip"""
+    try:
+        body = json.loads(await request.body())
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JSONResponse({"error": "Invalid JSON"}, status_code=400)
+
+    searches = body.get("searches") if isinstance(body, dict) else None
+    if not isinstance(searches, list) or not searches:
+        return JSONResponse({"error": "Expected a non-empty 'searches' list"}, status_code=400)
+    if len(searches) > MAX_MULTI_SEARCHES:
+        return JSONResponse({"error": f"At most {MAX_MULTI_SEARCHES} searches per request"}, status_code=400)
+
+    try:
+        parsed = []
+        for search_params in searches:
+            if not isinstance(search_params, dict):
+                raise ValueError("Each search must be an object")
+            parsed.append(parse_search(search_params))
+        results = await get_typesense_client().multi_search(parsed)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return ORJSONResponse({"results": results})
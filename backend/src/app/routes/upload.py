@@ -3,29 +3,119 @@
 This function is an asynchronous handler for the /upload endpoint.
 It reads the request body, decodes it, and parses it as JSON.
 It validates that the parsed data is a list (since Typesense typically expects a list of documents for indexing).
-If the data is valid, it indexes the data using the TypesenseClient.
+If the data is valid, it bulk imports the data using the TypesenseClient.
+The optional `action` (create/upsert/update/emplace) and `batch_size` query parameters
+control how documents are imported; the response carries a per-document result summary.
+Requests sent with `Content-Type: application/x-ndjson` are streamed instead: the body is
+read chunk by chunk, each line is parsed and validated on its own, and documents are
+forwarded to Typesense in fixed-size batches so memory stays flat for any payload size.
+With `?async=1` the validated documents are queued as an ingestion job instead and the
+handler returns 202 with the job id right away; progress is reported by GET /jobs/{id}.
+Async NDJSON uploads are validated into a temporary file rather than memory, and the
+job reads them back chunk by chunk.
 It handles specific errors like invalid JSON and general exceptions, returning appropriate error responses.
 A logger is set up for debugging and error logging.
 """
 
 import json
 import logging
+from typing import AsyncIterator, Dict
 from starlette.responses import JSONResponse
 from starlette.requests import Request
-from ..typesense_client import TypesenseClient
+from typesense.exceptions import ServiceUnavailable, Timeout
+from ..typesense_client import get_typesense_client, IMPORT_ACTIONS
+from ..jobs import DocumentSpool, job_manager
+from ..logging_config import Payload
 
 # Initialize logging
 logger = logging.getLogger(__name__)
 
-# Initialize Typesense client
-typesense_client = TypesenseClient()
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+async def iter_ndjson_documents(request: Request) -> AsyncIterator[Dict]:
+    """Parse and validate newline-delimited JSON documents from the request stream"""
+    buffer = b""
+    line_number = 0
+
+    def parse(line: bytes) -> Dict:
+        try:
+            document = json.loads(line)
+        except json.JSONDecodeError:
+            raise ValueError(f"Invalid JSON on line {line_number}")
+        if not isinstance(document, dict):
+            raise ValueError(f"Expected a JSON object on line {line_number}")
+        if "Id-repo" not in document:
+            raise ValueError(f"Missing 'Id-repo' field in document on line {line_number}")
+        return document
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield parse(line)
+
+    if buffer.strip():
+        line_number += 1
+        yield parse(buffer)
+
+def queue_job(typesense_client, documents, action: str, batch_size: int) -> JSONResponse:
+    """Hand validated documents to the background ingestion worker"""
+    job = job_manager.submit(typesense_client, documents, action, batch_size)
+    return JSONResponse(
+        {"status": "queued", "job_id": job.id, "status_url": f"/jobs/{job.id}"},
+        status_code=202,
+    )
+
 
 async def upload(request: Request):
+    typesense_client = get_typesense_client()
+    action = request.query_params.get("action", typesense_client.IMPORT_ACTION)
+    if action not in IMPORT_ACTIONS:
+        return JSONResponse({"error": f"Invalid action, expected one of {list(IMPORT_ACTIONS)}"}, status_code=400)
+
+    try:
+        batch_size = int(request.query_params.get("batch_size", typesense_client.IMPORT_BATCH_SIZE))
+        if batch_size < 1:
+            raise ValueError
+    except ValueError:
+        return JSONResponse({"error": "batch_size must be a positive integer"}, status_code=400)
+
+    run_async = request.query_params.get("async", "").lower() in ("1", "true", "yes")
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == NDJSON_CONTENT_TYPE and run_async:
+        spool = DocumentSpool()
+        try:
+            async for document in iter_ndjson_documents(request):
+                spool.append(document)
+        except ValueError as e:
+            spool.close()
+            return JSONResponse({"error": str(e)}, status_code=400)
+        return queue_job(typesense_client, spool, action, batch_size)
+
+    if content_type == NDJSON_CONTENT_TYPE:
+        try:
+            summary = await typesense_client.index_stream(
+                iter_ndjson_documents(request), action=action, batch_size=batch_size
+            )
+        except (ServiceUnavailable, Timeout):
+            raise  # Reported as 503/504 by the app's exception handlers
+        except Exception as e:
+            logger.error(f"Error processing streamed upload: {e}")
+            return JSONResponse({"error": str(e)}, status_code=400)
+        return JSONResponse({
+            "status": "success" if summary["failed"] == 0 else "partial",
+            "summary": summary,
+        })
+
     try:
         # Parse JSON data from the request body
         body = await request.body()
         data = json.loads(body.decode("utf-8"))
-        logger.debug(f"Received data: {data}")  # Log the received data
+        logger.debug("Received data: %s", Payload(data))  # Log the received data, truncated
 
         # Ensure data is a list
         if not isinstance(data, list):
@@ -36,12 +126,20 @@ async def upload(request: Request):
             if "Id-repo" not in document:
                 return JSONResponse({"error": "Missing 'Id-repo' field in document"}, status_code=400)
 
+        if run_async:
+            return queue_job(typesense_client, data, action, batch_size)
+
         # Index the data
-        typesense_client.index_data(data)
-        return JSONResponse({"status": "success"})
+        summary = await typesense_client.index_data(data, action=action, batch_size=batch_size)
+        return JSONResponse({
+            "status": "success" if summary["failed"] == 0 else "partial",
+            "summary": summary,
+        })
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON: {e}")
         return JSONResponse({"error": "Invalid JSON"}, status_code=400)
+    except (ServiceUnavailable, Timeout):
+        raise  # Reported as 503/504 by the app's exception handlers
     except Exception as e:
         logger.error(f"Error processing upload: {e}")
         return JSONResponse({"error": str(e)}, status_code=400)
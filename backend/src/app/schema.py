@@ -0,0 +1,114 @@
+# backend/src/app/schema.py
+"""
+Typed schema for the ossfinder collection and the coercion used to fit documents to it.
+
+Counts are int32, timestamps int64 epoch seconds and flags bool, so Typesense can sort and
+range-filter on them. Typed fields are optional: a value that cannot be coerced is dropped
+rather than failing the whole document. Fields marked as facets can be used in facet_by.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = "ossfinder"
+
+OSSFINDER_FIELDS: List[Dict[str, Any]] = [
+    {"name": "Id-repo", "type": "string"},
+    {"name": "name", "type": "string"},
+    {"name": "organisation", "type": "string", "facet": True},
+    {"name": "url", "type": "string"},
+    {"name": "website", "type": "string"},
+    {"name": "description", "type": "string"},
+    {"name": "license", "type": "string", "facet": True},
+    {"name": "latest_update", "type": "int64", "optional": True},
+    {"name": "language", "type": "string", "facet": True},
+    {"name": "last_commit", "type": "int64", "optional": True},
+    {"name": "open_pull_requests", "type": "int32", "optional": True},
+    {"name": "master_branch", "type": "string"},
+    {"name": "is_fork", "type": "bool", "optional": True, "facet": True},
+    {"name": "forked_from", "type": "string"},
+]
+
+FACET_FIELDS = tuple(field["name"] for field in OSSFINDER_FIELDS if field.get("facet"))
+
+_TRUE = {"true", "1", "yes", "t", "y"}
+_FALSE = {"false", "0", "no", "f", "n", ""}
+
+
+def collection_schema(name: str = COLLECTION_NAME) -> Dict[str, Any]:
+    """Collection creation payload for the typed ossfinder schema"""
+    return {"name": name, "fields": [dict(field) for field in OSSFINDER_FIELDS]}
+
+
+def field_types(fields: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Map field name to type for a schema's field list"""
+    return {field["name"]: field["type"] for field in fields}
+
+
+def to_epoch(value: Any) -> int:
+    """Epoch seconds from an int, a numeric string or an ISO 8601 date/datetime"""
+    if isinstance(value, bool):
+        raise ValueError(f"Not a timestamp: {value!r}")
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip()
+    if text.lstrip("-").isdigit():
+        return int(text)
+    parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"Not a boolean: {value!r}")
+
+
+def to_int(value: Any) -> int:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float):
+        return int(value)
+    return int(str(value).strip())
+
+
+def _coerce_value(value: Any, field_type: str) -> Any:
+    if field_type == "string":
+        return value if isinstance(value, str) else str(value)
+    if field_type == "int64":
+        return to_epoch(value)
+    if field_type == "int32":
+        return to_int(value)
+    if field_type == "bool":
+        return to_bool(value)
+    return value
+
+
+def coerce_document(document: Dict[str, Any], types: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Coerce a document's fields in place to the given (default: typed) schema"""
+    types = types if types is not None else field_types(OSSFINDER_FIELDS)
+    for name, field_type in types.items():
+        value = document.get(name)
+        if value is None:
+            continue
+        if field_type != "string" and value == "":
+            del document[name]
+            continue
+        try:
+            document[name] = _coerce_value(value, field_type)
+        except (TypeError, ValueError):
+            logger.debug(f"Dropping field '{name}' of {document.get('Id-repo')}: cannot coerce {value!r} to {field_type}")
+            del document[name]
+    return document
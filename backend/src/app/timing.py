@@ -0,0 +1,56 @@
+# backend/src/app/timing.py
+"""
+Server-Timing phase breakdown for responses.
+
+A handler calls start_timing() to collect phases for the current request; code further
+down (the Typesense client) adds its own phases through record(), which is a no-op when
+no collection is active. RequestLoggerMiddleware appends the overall ``total``.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+_current: ContextVar[Optional["ServerTiming"]] = ContextVar("server_timing", default=None)
+
+
+class ServerTiming:
+    """Named durations rendered as a Server-Timing header value"""
+
+    def __init__(self):
+        self.entries: List[Tuple[str, float, Optional[str]]] = []
+
+    def add(self, name: str, duration_ms: float, description: Optional[str] = None) -> None:
+        self.entries.append((name, duration_ms, description))
+
+    @contextmanager
+    def measure(self, name: str, description: Optional[str] = None) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000, description)
+
+    def header(self) -> str:
+        parts = []
+        for name, duration_ms, description in self.entries:
+            part = f"{name};dur={duration_ms:.1f}"
+            if description:
+                part += f';desc="{description}"'
+            parts.append(part)
+        return ", ".join(parts)
+
+
+def start_timing() -> ServerTiming:
+    """Collect Server-Timing phases for the current request"""
+    timing = ServerTiming()
+    _current.set(timing)
+    return timing
+
+
+def record(name: str, duration_ms: float, description: Optional[str] = None) -> None:
+    """Add a phase to the current request's Server-Timing, if one is being collected"""
+    timing = _current.get()
+    if timing is not None:
+        timing.add(name, duration_ms, description)
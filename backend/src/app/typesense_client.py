@@ -1,26 +1,127 @@
 # backend/src/app/typesense_client.py
-import typesense
-from typesense.exceptions import ObjectNotFound, ServiceUnavailable, TypesenseClientError
+import httpx
+from typesense.exceptions import (
+    ObjectAlreadyExists,
+    ObjectNotFound,
+    ObjectUnprocessable,
+    RequestForbidden,
+    RequestMalformed,
+    RequestUnauthorized,
+    ServerError,
+    ServiceUnavailable,
+    Timeout,
+    TypesenseClientError,
+)
 from dotenv import load_dotenv
-import time
+import asyncio
+import json
 import logging
 import os
+import re
+import time
+import orjson
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from urllib.parse import quote
+from typing import Optional, Dict, Any, List, AsyncIterator
+from .cache import normalize_query, search_cache, suggest_cache
+from .metrics import INGEST_DOCUMENTS, TYPESENSE_DURATION, TYPESENSE_ERRORS
+from .nodes import NodePool
+from .resilience import CircuitOpenError, RetryPolicy
+from .timing import record as record_timing
+from .schema import (
+    COLLECTION_NAME,
+    FACET_FIELDS,
+    OSSFINDER_FIELDS,
+    coerce_document,
+    collection_schema,
+    field_types,
+)
 
-# Initialize logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 # Global state for testing
 _client_instance = None
 _testing_mode = False
 
+# (node, operation) of requests that were cancelled mid-flight within the current
+# _with_timeout() call, so a deadline that cut one off can be charged to its node
+_cut_off: ContextVar[Optional[set]] = ContextVar("typesense_cut_off", default=None)
+
+# Typesense HTTP status codes mapped onto the typesense library's exception types,
+# so callers can keep catching the same errors as with the synchronous client.
+_ERROR_CODE_MAP = {
+    400: RequestMalformed,
+    401: RequestUnauthorized,
+    403: RequestForbidden,
+    404: ObjectNotFound,
+    409: ObjectAlreadyExists,
+    422: ObjectUnprocessable,
+    500: ServerError,
+    503: ServiceUnavailable,
+}
+
+# Actions accepted by Typesense's documents/import endpoint
+IMPORT_ACTIONS = ("create", "upsert", "update", "emplace")
+
+# Search parameters passed through to Typesense as-is
+SEARCH_OPTIONS = (
+    "include_fields",
+    "exclude_fields",
+    "highlight_fields",
+    "highlight_full_fields",
+    "highlight_affix_num_tokens",
+    "highlight_start_tag",
+    "highlight_end_tag",
+    "snippet_threshold",
+    "enable_highlight_v1",
+    "sort_by",
+    "filter_by",
+    "facet_by",
+    "max_facet_values",
+)
+
+# Document fields a /suggest entry carries
+SUGGEST_FIELDS = "name,organisation,url"
+EMPTY_SUGGESTIONS = b'{"suggestions":[]}'
+
+
+_SEARCH_TIME_MS = b'"search_time_ms":'
+_INTEGER = re.compile(rb"\s*(\d+)")
+
+def search_time_ms(body: bytes) -> Optional[int]:
+    """Typesense's search_time_ms, read from the end of a raw search response without decoding it"""
+    index = body.rfind(_SEARCH_TIME_MS)
+    if index == -1:
+        return None
+    match = _INTEGER.match(body, index + len(_SEARCH_TIME_MS))
+    return int(match.group(1)) if match else None
+
+def operation_name(method: str, path: str) -> str:
+    """Metrics label for a Typesense call"""
+    if path.endswith('/documents/search'):
+        return 'search'
+    if path == '/multi_search':
+        return 'multi_search'
+    if path.endswith('/documents/import'):
+        return 'import'
+    if '/documents/' in path:
+        return {'GET': 'retrieve', 'DELETE': 'delete'}.get(method, 'update')
+    return 'admin'
+
 class TypesenseClient:
     def __init__(self):
         self._initialized = False
-        self.client = None
+        self._verify_task: Optional[asyncio.Task] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        # /suggest lookups being fetched, so identical keystrokes share one request
+        self._suggestions_in_flight: Dict[Any, asyncio.Future] = {}
+        self.client: Optional[httpx.AsyncClient] = None
+        # Field types of the live collection; documents are coerced to these before import
+        self._field_types = field_types(OSSFINDER_FIELDS)
         self._initialize_config()
+        self.retry_policy = RetryPolicy()
+        self.nodes = NodePool.from_env(self.TYPESENSE_PROTOCOL, self.TYPESENSE_HOST, self.TYPESENSE_PORT)
         if not _testing_mode:  # Only initialize real client in production
             self._initialize_client()
 
@@ -34,29 +135,179 @@ class TypesenseClient:
             logger.warning(f"No .env file found at {env_path}")
 
         self.TIMEOUT_SECONDS = float(os.getenv('TYPESENSE_TIMEOUT_SECONDS', '30'))
+        self.SEARCH_BUDGET_SECONDS = float(os.getenv('TYPESENSE_SEARCH_BUDGET_SECONDS', '1'))
+        self.STARTUP_PROBE_SECONDS = float(os.getenv('TYPESENSE_STARTUP_PROBE_SECONDS', '2'))
         self.TYPESENSE_API_KEY = os.getenv('TYPESENSE_API_KEY', 'test_key' if _testing_mode else '')
         self.TYPESENSE_HOST = os.getenv('TYPESENSE_HOST', 'typesense')
         self.TYPESENSE_PORT = os.getenv('TYPESENSE_PORT', '8108')
         self.TYPESENSE_PROTOCOL = os.getenv('TYPESENSE_PROTOCOL', 'http')
+        self.MAX_CONNECTIONS = int(os.getenv('TYPESENSE_MAX_CONNECTIONS', '100'))
+        self.MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('TYPESENSE_MAX_KEEPALIVE_CONNECTIONS', '20'))
+        self.KEEPALIVE_EXPIRY = float(os.getenv('TYPESENSE_KEEPALIVE_EXPIRY', '30'))
+        self.DEFAULT_PER_PAGE = int(os.getenv('SEARCH_DEFAULT_PER_PAGE', '10'))
+        self.MAX_PER_PAGE = int(os.getenv('SEARCH_MAX_PER_PAGE', '100'))
+        self.IMPORT_BATCH_SIZE = int(os.getenv('TYPESENSE_IMPORT_BATCH_SIZE', '1000'))
+        self.IMPORT_CONCURRENCY = int(os.getenv('TYPESENSE_IMPORT_CONCURRENCY', '4'))
+        self.IMPORT_ACTION = os.getenv('TYPESENSE_IMPORT_ACTION', 'create')
+        self.NODE_CHECK_SECONDS = float(os.getenv('TYPESENSE_NODE_CHECK_SECONDS', '15'))
+        self.SUGGEST_PER_PAGE = int(os.getenv('SUGGEST_PER_PAGE', '5'))
+        self.SUGGEST_MAX_PER_PAGE = int(os.getenv('SUGGEST_MAX_PER_PAGE', '10'))
+        self.SUGGEST_MIN_CHARS = int(os.getenv('SUGGEST_MIN_CHARS', '2'))
+        self.SUGGEST_CUTOFF_MS = int(os.getenv('SUGGEST_CUTOFF_MS', '10'))
+        self.SUGGEST_BUDGET_SECONDS = float(os.getenv('SUGGEST_BUDGET_SECONDS', '0.25'))
 
         if not self.TYPESENSE_API_KEY and not _testing_mode:
             raise ValueError("TYPESENSE_API_KEY is required")
 
     def _initialize_client(self):
-        """Initialize the Typesense client with proper configuration"""
-        self.client = typesense.Client({
-            'api_key': self.TYPESENSE_API_KEY,
-            'nodes': [{
-                'host': self.TYPESENSE_HOST,
-                'port': self.TYPESENSE_PORT,
-                'protocol': self.TYPESENSE_PROTOCOL,
-                'connection_timeout_seconds': int(self.TIMEOUT_SECONDS)
-            }]
-        })
-        self.ensure_collection_exists()
-        self._initialized = True
-
-    def health(self):
+        """Initialize the pooled, keep-alive HTTP client used to talk to Typesense.
+
+        No network I/O happens here; the collection is verified by startup(). One pool
+        serves every node: requests are sent to absolute node URLs, and the base URL
+        (the first node) only applies to the few direct calls such as exports.
+        """
+        self.client = httpx.AsyncClient(
+            base_url=self.nodes.nodes[0].url,
+            headers={'X-TYPESENSE-API-KEY': self.TYPESENSE_API_KEY},
+            timeout=httpx.Timeout(self.TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=self.MAX_CONNECTIONS,
+                max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=self.KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    @property
+    def ready(self) -> bool:
+        """Whether the collection has been verified"""
+        return self._initialized
+
+    async def startup(self):
+        """Probe Typesense once and keep verifying the collection in the background.
+
+        Called from the application lifespan. Startup never waits longer than
+        ``STARTUP_PROBE_SECONDS``; readiness is reported through ``ready``.
+        """
+        if self.client is None:
+            return
+        if len(self.nodes.nodes) > 1:
+            self._monitor_task = asyncio.create_task(self._monitor_nodes())
+        try:
+            self._initialized = await asyncio.wait_for(self._ensure_collection(), self.STARTUP_PROBE_SECONDS)
+        except Exception as e:
+            logger.warning(f"Typesense not ready at startup ({e!r}), verifying collection in the background")
+        if not self._initialized:
+            self._verify_task = asyncio.create_task(self._verify_until_ready())
+
+    async def _verify_until_ready(self):
+        while not self._initialized:
+            self._initialized = await self.ensure_collection_exists()
+            if not self._initialized:
+                await asyncio.sleep(1)
+        logger.info("Typesense collection verified, backend ready")
+
+    async def _monitor_nodes(self):
+        """Keep track of the cluster leader, checking every NODE_CHECK_SECONDS"""
+        while True:
+            try:
+                await self.refresh_leader()
+            except Exception:
+                # One bad round must not leave writes going to a stale leader for good
+                logger.exception("Refreshing the Typesense leader failed, trying again next check")
+            await asyncio.sleep(self.NODE_CHECK_SECONDS)
+
+    async def refresh_leader(self):
+        """Ask every node for its raft state (GET /debug) and route writes to the leader.
+
+        The probes also feed each node's circuit breaker, so a node that went down is
+        noticed, and one that came back is used again, without waiting for traffic.
+        """
+        async def probe(node):
+            try:
+                response = await self.client.get(f"{node.url}/debug", timeout=self.STARTUP_PROBE_SECONDS)
+                response.raise_for_status()
+                debug = response.json()
+                if not isinstance(debug, dict):
+                    raise ValueError(f"unexpected /debug body {debug!r}")
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning(f"Typesense node {node.url} failed its health probe: {e!r}")
+                node.breaker.record_failure()
+                return None
+            node.breaker.record_success()
+            # Raft state 1 is the leader, 4 a follower
+            return debug.get('state')
+
+        states = await asyncio.gather(*(probe(node) for node in self.nodes.nodes))
+        leader = next((node for node, state in zip(self.nodes.nodes, states) if state == 1), None)
+        if leader is not self.nodes.leader:
+            logger.info(f"Typesense leader is now {leader.url if leader else 'unknown'}")
+            self.nodes.set_leader(leader)
+
+    async def aclose(self):
+        """Stop background tasks and close the underlying connection pool"""
+        for task in (self._verify_task, self._monitor_task):
+            if task is not None:
+                task.cancel()
+        self._verify_task = None
+        self._monitor_task = None
+        if self.client is not None:
+            await self.client.aclose()
+
+    async def _request(self, method: str, path: str, write: Optional[bool] = None, **kwargs) -> httpx.Response:
+        """Send a request to a Typesense node and raise the matching typesense exception on errors.
+
+        Writes (anything but GET, unless ``write`` says otherwise) go to the leader,
+        reads to the nearest healthy node. The outcome is recorded against the node
+        and in the Typesense latency and error metrics.
+        """
+        if write is None:
+            write = method != 'GET'
+        operation = operation_name(method, path)
+        try:
+            node = self.nodes.select(write)
+        except CircuitOpenError:
+            TYPESENSE_ERRORS.inc(operation=operation, error='CircuitOpenError')
+            raise
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, f"{node.url}{path}", **kwargs)
+        except httpx.TimeoutException as e:
+            node.record_failure()
+            TYPESENSE_ERRORS.inc(operation=operation, error='Timeout')
+            raise Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            node.record_failure()
+            TYPESENSE_ERRORS.inc(operation=operation, error='ServiceUnavailable')
+            raise ServiceUnavailable(str(e)) from e
+        except asyncio.CancelledError:
+            # Not a verdict on the node by itself: the client may have disconnected, or a
+            # coalesced suggest or multi-search sibling was dropped. _with_timeout charges
+            # the node when its deadline is what cut the request off.
+            cut_off = _cut_off.get()
+            if cut_off is not None:
+                cut_off.add((node, operation))
+            raise
+
+        elapsed = time.perf_counter() - start
+        TYPESENSE_DURATION.observe(elapsed, operation=operation, node=node.url)
+        latency_ms = elapsed * 1000
+        if response.status_code >= 500:
+            node.record_failure(latency_ms)
+        else:
+            # A 4xx says nothing about the node's health
+            node.record_success(latency_ms)
+
+        if response.status_code >= 400:
+            try:
+                message = response.json().get('message', response.text)
+            except ValueError:
+                message = response.text
+            error_class = _ERROR_CODE_MAP.get(response.status_code, TypesenseClientError)
+            TYPESENSE_ERRORS.inc(operation=operation, error=error_class.__name__)
+            raise error_class(f"[Errno {response.status_code}] {message}")
+        return response
+
+    async def health(self):
         """Proper health check implementation for current Typesense API"""
         if not hasattr(self, 'client') or self.client is None:
             return {
@@ -66,119 +317,441 @@ class TypesenseClient:
 
         try:
             # Use the collections API as a health check
-            self.client.collections['ossfinder'].retrieve()
+            await self._request('GET', '/collections/ossfinder')
             return {
                 "ok": True,
                 "status": "operational",
-                "version": "unknown"  # Can't get version directly in current API
+                "version": "unknown",  # Can't get version directly in current API
+                "nodes": self.nodes.stats()
             }
         except Exception as e:
             return {
                 "ok": False,
                 "error": str(e),
-                "status": "unavailable"
+                "status": "unavailable",
+                "nodes": self.nodes.stats()
             }
 
-    def _with_timeout(self, func, *args, **kwargs):
-        """Wrapper to add timeout to operations"""
-        start_time = time.time()
-        last_exception = None
+    async def _with_timeout(self, func, *args, budget: Optional[float] = None, **kwargs):
+        """Run an operation with retries and backoff, within a deadline.
 
-        while time.time() - start_time < self.TIMEOUT_SECONDS:
-            try:
-                return func(*args, **kwargs)
-            except (ServiceUnavailable, TypesenseClientError) as e:
-                last_exception = e
-                time.sleep(1)
-                continue
+        Only retryable errors (unavailable, server errors, timeouts) are retried, and
+        never past ``budget`` seconds (default ``TIMEOUT_SECONDS``); a retry goes to
+        another node when one is healthy. Other errors, such as 4xx responses, and
+        open circuits on every node are raised straight away.
+        """
+        loop = asyncio.get_running_loop()
+        budget = budget or self.TIMEOUT_SECONDS
+        deadline = loop.time() + budget
+        attempt = 0
+        cut_off = set()
+        token = _cut_off.set(cut_off)
+        try:
+            while True:
+                try:
+                    return await asyncio.wait_for(func(*args, **kwargs), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    # The deadline cancelled these requests: their nodes were too slow
+                    for node, operation in cut_off:
+                        node.record_failure()
+                        TYPESENSE_ERRORS.inc(operation=operation, error='Timeout')
+                    raise Timeout(f"Operation exceeded its {budget}s deadline")
+                except Exception as e:
+                    if isinstance(e, CircuitOpenError) or not self.retry_policy.is_retryable(e):
+                        raise
+                    attempt += 1
+                    delay = self.retry_policy.delay(attempt)
+                    if attempt >= self.retry_policy.max_attempts or loop.time() + delay >= deadline:
+                        raise
+                    logger.debug(f"Retrying after {e!r} (attempt {attempt}, sleeping {delay:.3f}s)")
+                    await asyncio.sleep(delay)
+        finally:
+            _cut_off.reset(token)
 
-        raise TimeoutError(
-            f"Operation timed out after {self.TIMEOUT_SECONDS} seconds"
-        ) from last_exception
+    async def _ensure_initialized(self):
+        """Make sure the collection exists before writing to it"""
+        if self._initialized:
+            return
+        if self._verify_task is not None and not self._verify_task.done():
+            await asyncio.shield(self._verify_task)
+        else:
+            self._initialized = await self.ensure_collection_exists()
 
-    def ensure_collection_exists(self):
+    async def ensure_collection_exists(self):
         """Ensure collection exists with timeout handling"""
         if not self.client:
             return False
 
         try:
-            return self._with_timeout(self._ensure_collection)
+            return await self._with_timeout(self._ensure_collection)
         except Exception as e:
             logger.error(f"Collection verification failed: {str(e)}")
             return False
 
-    def _ensure_collection(self):
+    async def _ensure_collection(self):
         """Actual collection existence check"""
-        collection_name = "ossfinder"
+        collection_name = COLLECTION_NAME
         try:
-            self.client.collections[collection_name].retrieve()
+            response = await self._request('GET', f'/collections/{collection_name}')
+            fields = response.json().get('fields')
+            if fields:
+                self._field_types = field_types(fields)
             logger.info(f"Collection '{collection_name}' exists")
-            return
+            return True
         except ObjectNotFound:
-            schema = {
-                "name": collection_name,
-                "fields": [
-                    {"name": "Id-repo", "type": "string"},
-                    {"name": "name", "type": "string"},
-                    {"name": "organisation", "type": "string"},
-                    {"name": "url", "type": "string"},
-                    {"name": "website", "type": "string"},
-                    {"name": "description", "type": "string"},
-                    {"name": "license", "type": "string"},
-                    {"name": "latest_update", "type": "string"},
-                    {"name": "language", "type": "string"},
-                    {"name": "last_commit", "type": "string"},
-                    {"name": "open_pull_requests", "type": "string"},
-                    {"name": "master_branch", "type": "string"},
-                    {"name": "is_fork", "type": "string"},
-                    {"name": "forked_from", "type": "string"},
-                ],
-            }
-            self.client.collections.create(schema)
+            await self._request('POST', '/collections', json=collection_schema(collection_name))
+            self._field_types = field_types(OSSFINDER_FIELDS)
             logger.info(f"Created collection '{collection_name}'")
+            return True
 
-    def search(self, query: str) -> Dict:
-        """Search with timeout handling"""
-        return self._with_timeout(
-            self.client.collections['ossfinder'].documents.search,
-            {
-                'q': query,
-                'query_by': 'name,description,organisation',
-                'timeout_ms': int(self.TIMEOUT_SECONDS * 1000)
-            }
+    def _search_params(self, query: str, page: int, per_page: Optional[int], options: Dict) -> Dict:
+        """Validate search options and build the Typesense search parameters.
+
+        ``per_page`` is capped at ``MAX_PER_PAGE``; ``options`` may carry any of
+        ``SEARCH_OPTIONS`` (field projection, highlighting, sorting, filtering and
+        faceting). ``facet_by`` is limited to the schema's ``FACET_FIELDS``.
+        """
+        unknown = set(options) - set(SEARCH_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unsupported search options: {sorted(unknown)}")
+        if options.get("facet_by"):
+            facets = {name.strip() for name in options["facet_by"].split(",")}
+            if not facets <= set(FACET_FIELDS):
+                raise ValueError(f"Can only facet by {list(FACET_FIELDS)}")
+
+        params = {
+            'q': query,
+            'query_by': 'name,description,organisation',
+            'page': page,
+            'per_page': min(per_page or self.DEFAULT_PER_PAGE, self.MAX_PER_PAGE),
+        }
+        params.update({name: value for name, value in options.items() if value is not None})
+        return params
+
+    @staticmethod
+    def _cache_key(params: Dict):
+        options = {name: value for name, value in params.items() if name not in ('q', 'query_by')}
+        return search_cache.make_key(params['q'], **options)
+
+    def search_etag(self, query: str, page: int = 1, per_page: Optional[int] = None, **options) -> str:
+        """ETag of a search's results: the normalized query and parameters at the current index generation"""
+        return search_cache.etag(self._cache_key(self._search_params(query, page, per_page, options)))
+
+    async def search(
+        self,
+        query: str,
+        page: int = 1,
+        per_page: Optional[int] = None,
+        **options,
+    ) -> Dict:
+        """Search with timeout handling, served from the result cache when possible"""
+        raw = await self.search_raw(query, page, per_page, **options)
+        started = time.perf_counter()
+        results = orjson.loads(raw)
+        record_timing('decode', (time.perf_counter() - started) * 1000)
+        return results
+
+    async def search_raw(
+        self,
+        query: str,
+        page: int = 1,
+        per_page: Optional[int] = None,
+        **options,
+    ) -> bytes:
+        """Search and return Typesense's JSON response body untouched.
+
+        Results are cached as these bytes, so a cache hit costs no decoding either.
+        The cache lookup, the Typesense round trip and Typesense's own
+        ``search_time_ms`` are recorded as Server-Timing phases.
+        """
+        params = self._search_params(query, page, per_page, options)
+        cache_key = self._cache_key(params)
+        started = time.perf_counter()
+        cached = search_cache.get(cache_key)
+        record_timing('cache', (time.perf_counter() - started) * 1000, 'hit' if cached is not None else 'miss')
+        if cached is not None:
+            return cached
+
+        generation = search_cache.generation
+        started = time.perf_counter()
+        response = await self._with_timeout(
+            self._request,
+            'GET',
+            '/collections/ossfinder/documents/search',
+            budget=self.SEARCH_BUDGET_SECONDS,
+            params={**params, 'timeout_ms': int(self.SEARCH_BUDGET_SECONDS * 1000)}
         )
+        record_timing('typesense', (time.perf_counter() - started) * 1000)
+        raw = response.content
+        engine_ms = search_time_ms(raw)
+        if engine_ms is not None:
+            record_timing('ts-search', engine_ms, 'Typesense search_time_ms')
+        search_cache.set(cache_key, raw, generation=generation)
+        return raw
+
+    async def suggest(self, prefix: str, limit: Optional[int] = None) -> bytes:
+        """Prefix search over name and organisation for search-as-you-type.
+
+        Returns a small JSON body, ``{"suggestions": [{name, organisation, url}, ...]}``.
+        Prefixes shorter than ``SUGGEST_MIN_CHARS`` never reach Typesense, results are
+        cached briefly in ``suggest_cache``, and concurrent lookups of the same prefix
+        share one Typesense request.
+        """
+        prefix = normalize_query(prefix)
+        limit = min(limit or self.SUGGEST_PER_PAGE, self.SUGGEST_MAX_PER_PAGE)
+        if len(prefix) < self.SUGGEST_MIN_CHARS:
+            return EMPTY_SUGGESTIONS
+
+        key = suggest_cache.make_key(prefix, limit=limit)
+        started = time.perf_counter()
+        cached = suggest_cache.get(key)
+        record_timing('cache', (time.perf_counter() - started) * 1000, 'hit' if cached is not None else 'miss')
+        if cached is not None:
+            return cached
+
+        pending = self._suggestions_in_flight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_suggestions(prefix, limit, key))
+            self._suggestions_in_flight[key] = pending
+            pending.add_done_callback(lambda _: self._suggestions_in_flight.pop(key, None))
+        # A client that goes away must not cancel the lookup the others are waiting on
+        return await asyncio.shield(pending)
+
+    async def _fetch_suggestions(self, prefix: str, limit: int, key) -> bytes:
+        """Ask Typesense for suggestions, cheaply: few hits, few fields, a hard search cutoff"""
+        generation = suggest_cache.generation
+        started = time.perf_counter()
+        response = await self._with_timeout(
+            self._request,
+            'GET',
+            '/collections/ossfinder/documents/search',
+            budget=self.SUGGEST_BUDGET_SECONDS,
+            params={
+                'q': prefix,
+                'query_by': 'name,organisation',
+                'prefix': 'true',
+                'per_page': limit,
+                'include_fields': SUGGEST_FIELDS,
+                'enable_highlight_v1': 'false',
+                'drop_tokens_threshold': 0,
+                'search_cutoff_ms': self.SUGGEST_CUTOFF_MS,
+                'use_cache': 'true',
+                'cache_ttl': max(1, int(suggest_cache.ttl_seconds)),
+                'timeout_ms': int(self.SUGGEST_BUDGET_SECONDS * 1000),
+            },
+        )
+        record_timing('typesense', (time.perf_counter() - started) * 1000)
+        results = orjson.loads(response.content)
+        if 'search_time_ms' in results:
+            record_timing('ts-search', results['search_time_ms'], 'Typesense search_time_ms')
+        body = orjson.dumps({"suggestions": [hit.get('document', {}) for hit in results.get('hits', [])]})
+        suggest_cache.set(key, body, generation=generation)
+        return body
+
+    async def multi_search(self, searches: List[Dict]) -> List[Dict]:
+        """Run several searches in one Typesense multi_search call.
+
+        Each search is a dict with ``q`` and optionally ``page``, ``per_page`` and
+        any of ``SEARCH_OPTIONS``. Searches found in the result cache are answered
+        from it; only the misses are sent to Typesense. Results come back in the
+        order of ``searches``; a failed search yields Typesense's error object.
+        """
+        params_list = []
+        for search in searches:
+            options = {name: value for name, value in search.items() if name not in ('q', 'page', 'per_page')}
+            params_list.append(self._search_params(
+                search.get('q', ''), search.get('page', 1), search.get('per_page'), options
+            ))
+
+        results: List[Optional[Dict]] = []
+        misses = []
+        for index, params in enumerate(params_list):
+            cached = search_cache.get(self._cache_key(params))
+            results.append(orjson.loads(cached) if cached is not None else None)
+            if cached is None:
+                misses.append(index)
+
+        if misses:
+            generation = search_cache.generation
+            response = await self._with_timeout(
+                self._request,
+                'POST',
+                '/multi_search',
+                write=False,
+                budget=self.SEARCH_BUDGET_SECONDS,
+                params={'timeout_ms': int(self.SEARCH_BUDGET_SECONDS * 1000)},
+                json={'searches': [
+                    {'collection': COLLECTION_NAME, **params_list[index]} for index in misses
+                ]},
+            )
+            for index, result in zip(misses, orjson.loads(response.content)['results']):
+                results[index] = result
+                if 'error' not in result:
+                    search_cache.set(self._cache_key(params_list[index]), orjson.dumps(result), generation=generation)
 
-    def index_data(self, data: List[Dict]) -> None:
-        """Index data with timeout handling"""
-        return self._with_timeout(self._index_data_impl, data)
+        return results
 
-    def _index_data_impl(self, data: List[Dict]) -> None:
+    async def index_data(
+        self,
+        data: List[Dict],
+        action: Optional[str] = None,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Bulk index data through the documents/import endpoint.
+
+        Documents are sent as JSONL in batches of ``batch_size``, with at most
+        ``IMPORT_CONCURRENCY`` batches in flight. Returns a summary with the
+        number of imported and failed documents and the error for each failure.
+        """
+        action = self._check_action(action)
+        await self._ensure_initialized()
+        return await self._index_data_impl(data, action, batch_size or self.IMPORT_BATCH_SIZE)
+
+    async def _index_data_impl(self, data: List[Dict], action: str, batch_size: int) -> Dict[str, Any]:
         """Actual data indexing implementation"""
         for document in data:
+            self._prepare_document(document)
+
+        semaphore = asyncio.Semaphore(self.IMPORT_CONCURRENCY)
+
+        async def run_batch(batch: List[Dict]) -> List[Dict]:
+            async with semaphore:
+                return await self._with_timeout(self._import_batch, batch, action)
+
+        batches = [data[i:i + batch_size] for i in range(0, len(data), batch_size)]
+        batch_results = await asyncio.gather(*(run_batch(batch) for batch in batches))
+
+        summary = self._new_summary(action)
+        for batch, results in zip(batches, batch_results):
+            self._record_batch(summary, batch, results)
+
+        self._finish_import(summary)
+        return summary
+
+    async def index_stream(
+        self,
+        documents: AsyncIterator[Dict],
+        action: Optional[str] = None,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Bulk index documents from an async iterator without materializing them.
+
+        Documents are grouped into batches as they arrive. A new batch is only
+        started once one of the ``IMPORT_CONCURRENCY`` slots is free, so at most
+        that many batches (plus the one being filled) are held in memory.
+        If the iterator or a batch raises, in-flight batches are awaited before
+        the error propagates; batches sent before that point stay imported.
+        """
+        action = self._check_action(action)
+        batch_size = batch_size or self.IMPORT_BATCH_SIZE
+        await self._ensure_initialized()
+
+        summary = self._new_summary(action)
+        semaphore = asyncio.Semaphore(self.IMPORT_CONCURRENCY)
+        tasks = set()
+        failures = []
+
+        async def run_batch(batch: List[Dict]) -> None:
             try:
-                if "open_pull_requests" in document and not isinstance(document["open_pull_requests"], str):
-                    document["open_pull_requests"] = str(document["open_pull_requests"])
+                results = await self._with_timeout(self._import_batch, batch, action)
+                self._record_batch(summary, batch, results)
+            except Exception as e:
+                failures.append(e)
+            finally:
+                semaphore.release()
+
+        async def submit(batch: List[Dict]) -> None:
+            await semaphore.acquire()
+            if failures:
+                semaphore.release()
+                raise failures[0]
+            task = asyncio.create_task(run_batch(batch))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        try:
+            batch = []
+            async for document in documents:
+                batch.append(self._prepare_document(document))
+                if len(batch) >= batch_size:
+                    await submit(batch)
+                    batch = []
+            if batch:
+                await submit(batch)
+        finally:
+            await asyncio.gather(*tasks)
+
+        if failures:
+            raise failures[0]
+        self._finish_import(summary)
+        return summary
 
-                document_id = document["Id-repo"]
-                document["id"] = document_id
+    def _check_action(self, action: Optional[str]) -> str:
+        """Resolve and validate an import action"""
+        action = action or self.IMPORT_ACTION
+        if action not in IMPORT_ACTIONS:
+            raise ValueError(f"Unsupported import action '{action}', expected one of {IMPORT_ACTIONS}")
+        return action
 
-                if self.document_exists(document_id):
-                    logger.debug(f"Document {document_id} exists, skipping")
-                    continue
+    @staticmethod
+    def _new_summary(action: str) -> Dict[str, Any]:
+        """Empty import summary"""
+        return {"action": action, "total": 0, "imported": 0, "failed": 0, "errors": []}
 
-                self.client.collections['ossfinder'].documents.create(document)
-                logger.info(f"Indexed document: {document_id}")
-            except TypesenseClientError as e:
-                logger.error(f"Error indexing document {document.get('Id-repo', 'unknown')}: {e}")
+    @staticmethod
+    def _record_batch(summary: Dict[str, Any], batch: List[Dict], results: List[Dict]) -> None:
+        """Fold the per-document results of one import batch into the summary"""
+        summary["total"] += len(batch)
+        for document, result in zip(batch, results):
+            if result.get("success"):
+                summary["imported"] += 1
+            else:
+                summary["failed"] += 1
+                summary["errors"].append({
+                    "id": document["id"],
+                    "code": result.get("code"),
+                    "error": result.get("error", "unknown error"),
+                })
+
+    @staticmethod
+    def _finish_import(summary: Dict[str, Any]) -> None:
+        """Log and count the import summary and invalidate cached results if anything changed"""
+        INGEST_DOCUMENTS.inc(summary["imported"], result="imported")
+        INGEST_DOCUMENTS.inc(summary["failed"], result="failed")
+        if summary["imported"]:
+            search_cache.bump_generation()
+            suggest_cache.bump_generation()
+        logger.info(
+            f"Imported {summary['imported']}/{summary['total']} documents "
+            f"({summary['failed']} failed, action={summary['action']})"
+        )
+
+    def _prepare_document(self, document: Dict) -> Dict:
+        """Normalize a document in place before it is sent to Typesense"""
+        coerce_document(document, self._field_types)
+        document["id"] = document["Id-repo"]
+        return document
+
+    async def _import_batch(self, batch: List[Dict], action: str, collection: str = COLLECTION_NAME) -> List[Dict]:
+        """Send one JSONL batch to documents/import and return the per-document results"""
+        body = "\n".join(json.dumps(document) for document in batch).encode("utf-8")
+        response = await self._request(
+            'POST',
+            f'/collections/{collection}/documents/import',
+            params={'action': action, 'batch_size': len(batch)},
+            content=body,
+            headers={'Content-Type': 'text/plain'},
+        )
+        return [json.loads(line) for line in response.text.splitlines() if line]
 
-    def document_exists(self, document_id: str) -> bool:
+    async def document_exists(self, document_id: str) -> bool:
         """Check if document exists with timeout handling"""
-        return self._with_timeout(self._document_exists_impl, document_id)
+        return await self._with_timeout(self._document_exists_impl, document_id)
 
-    def _document_exists_impl(self, document_id: str) -> bool:
+    async def _document_exists_impl(self, document_id: str) -> bool:
         """Actual document existence check"""
         try:
-            self.client.collections['ossfinder'].documents[document_id].retrieve()
+            await self._request('GET', f'/collections/ossfinder/documents/{quote(document_id, safe="")}')
             return True
         except ObjectNotFound:
             return False
@@ -194,4 +767,4 @@ def set_testing_mode(enabled: bool = True):
     """Enable testing mode (uses mock client)"""
     global _testing_mode, _client_instance
     _testing_mode = enabled
-    _client_instance = None  # Reset to force recreation
\ No newline at end of file
+    _client_instance = None  # Reset to force recreation
@@ -1,11 +1,15 @@
 # backend/tests/conftest.py
 import os
+import orjson
 import pytest
+import pytest_asyncio
 from dotenv import load_dotenv
 from pathlib import Path
 from starlette.testclient import TestClient
 from app.main import app
 from app.typesense_client import TypesenseClient, set_testing_mode, get_typesense_client
+from app.cache import search_cache, suggest_cache
+from app.schema import OSSFINDER_FIELDS
 from typesense.exceptions import ObjectNotFound, TypesenseClientError
 
 
@@ -39,22 +43,7 @@ assert 'TYPESENSE_API_KEY' in os.environ, "TYPESENSE_API_KEY not found in enviro
 # --------------------------
 
 TYPESENSE_COLLECTION_SCHEMA = {
-    'fields': [
-        {"name": "Id-repo", "type": "string"},
-        {"name": "name", "type": "string"},
-        {"name": "organisation", "type": "string"},
-        {"name": "url", "type": "string"},
-        {"name": "website", "type": "string"},
-        {"name": "description", "type": "string"},
-        {"name": "license", "type": "string"},
-        {"name": "latest_update", "type": "string"},
-        {"name": "language", "type": "string"},
-        {"name": "last_commit", "type": "string"},
-        {"name": "open_pull_requests", "type": "string"},
-        {"name": "master_branch", "type": "string"},
-        {"name": "is_fork", "type": "string"},
-        {"name": "forked_from", "type": "string"},
-    ]
+    'fields': OSSFINDER_FIELDS
 }
 
 
@@ -83,6 +72,13 @@ class MockTypesenseClient:
     def __init__(self):
         self.collections = {}
         self.health_status = {"ok": True}
+        self.ready = True
+
+    async def startup(self):
+        pass
+
+    async def aclose(self):
+        pass
 
     def __getitem__(self, name):
         if name not in self.collections:
@@ -94,7 +90,7 @@ class MockTypesenseClient:
         self.collections[name] = MockCollection(name)
         return schema
 
-    def search(self, params):
+    async def search(self, params, page=1, per_page=10, **options):
         # Handle both string query and dictionary params
         if isinstance(params, str):
             query = params.lower()
@@ -110,16 +106,40 @@ class MockTypesenseClient:
                         'highlight': {},
                         'text_match': 12345
                     })
+        per_page = per_page or 10
         return {
             'facet_counts': [],
             'found': len(hits),
-            'hits': hits,
+            'hits': hits[(page - 1) * per_page:page * per_page],
             'out_of': len(hits),
-            'page': 1,
+            'page': page,
+            'request_params': {'per_page': per_page, 'q': query},
             'search_time_ms': 1
         }
 
-    def health(self):
+    def search_etag(self, query, page=1, per_page=None, **options):
+        return search_cache.etag(search_cache.make_key(query, page=page, per_page=per_page, **options))
+
+    async def search_raw(self, params, page=1, per_page=10, **options):
+        return orjson.dumps(await self.search(params, page=page, per_page=per_page, **options))
+
+    async def suggest(self, prefix, limit=None):
+        prefix = prefix.lower().strip()
+        suggestions = [
+            {"name": doc.get("name", ""), "organisation": doc.get("organisation", ""), "url": doc.get("url", "")}
+            for collection in self.collections.values()
+            for doc in collection.documents.values()
+            if len(prefix) >= 2 and doc.get("name", "").lower().startswith(prefix)
+        ]
+        return orjson.dumps({"suggestions": suggestions[:limit or 5]})
+
+    async def multi_search(self, searches):
+        return [
+            await self.search(search['q'], page=search.get('page', 1), per_page=search.get('per_page'))
+            for search in searches
+        ]
+
+    async def health(self):
         return self.health_status
 
 
@@ -138,6 +158,8 @@ def mock_typesense():
 def unit_typesense_client(monkeypatch, mock_typesense):
     """Fixture for unit tests with mocked Typesense"""
     set_testing_mode(True)
+    search_cache.clear()
+    suggest_cache.clear()
     client = TypesenseClient()
     monkeypatch.setattr(client, 'client', mock_typesense)
     yield client
@@ -145,11 +167,12 @@ def unit_typesense_client(monkeypatch, mock_typesense):
 
 
 @pytest.fixture
-def unit_client(monkeypatch, mock_typesense):
+def unit_client(monkeypatch, mock_typesense, unit_typesense_client):
     """TestClient fixture for unit tests"""
     # Patch all possible client access points
     monkeypatch.setattr('app.typesense_client.get_typesense_client', lambda: mock_typesense)
-    monkeypatch.setattr('app.routes.search.typesense_client', mock_typesense)
+    monkeypatch.setattr('app.routes.search.get_typesense_client', lambda: mock_typesense)
+    monkeypatch.setattr('app.routes.upload.get_typesense_client', lambda: unit_typesense_client)
     monkeypatch.setattr('app.main.get_typesense_client', lambda: mock_typesense)
 
     # Ensure testing mode is enabled
@@ -165,8 +188,8 @@ def unit_client(monkeypatch, mock_typesense):
 # Integration Test Fixtures
 # --------------------------
 
-@pytest.fixture(scope="module")
-def integration_typesense_client():
+@pytest_asyncio.fixture
+async def integration_typesense_client():
     """Verified Typesense connection with debug output and cleanup"""
     # 1. Environment Verification
     if not os.getenv('TYPESENSE_API_KEY'):
@@ -183,7 +206,7 @@ def integration_typesense_client():
 
     # 4. Connection Test
     try:
-        health = client.health()
+        health = await client.health()
         print(f"Health Status: {health}")
         if not health.get('ok'):
             pytest.skip(f"Service unavailable: {health}")
@@ -194,11 +217,14 @@ def integration_typesense_client():
 
     # 5. Cleanup (improved version)
     try:
-        client.client.collections['ossfinder'].documents.delete({
-            'filter_by': 'id: test_*'
-        })
+        await client.client.delete(
+            '/collections/ossfinder/documents',
+            params={'filter_by': 'id: test_*'}
+        )
     except Exception as e:
         print(f"Cleanup note: {str(e)}")  # Non-fatal
+    finally:
+        await client.aclose()
 
 
 @pytest.fixture
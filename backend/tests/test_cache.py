@@ -0,0 +1,93 @@
+# backend/tests/test_cache.py
+import asyncio
+import time
+import httpx
+import pytest
+from app.cache import SearchCache, search_cache
+
+
+def test_cache_key_normalizes_query():
+    """Case and whitespace differences map onto the same entry"""
+    assert SearchCache.make_key("  Solar   Energy ", page=1) == SearchCache.make_key("solar energy", page="1")
+    assert SearchCache.make_key("solar", page=1) != SearchCache.make_key("solar", page=2)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = SearchCache(max_entries=2, ttl_seconds=60)
+    cache.set(("a",), 1)
+    cache.set(("b",), 2)
+    assert cache.get(("a",)) == 1  # "b" is now the least recently used
+    cache.set(("c",), 3)
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_expires_entries():
+    cache = SearchCache(max_entries=10, ttl_seconds=0.01)
+    cache.set(("a",), 1)
+    time.sleep(0.02)
+    assert cache.get(("a",)) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_generation_bump_invalidates_entries():
+    cache = SearchCache(max_entries=10, ttl_seconds=60)
+    cache.set(("a",), 1)
+    cache.bump_generation()
+    assert cache.get(("a",)) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_is_served_from_cache_until_upload(unit_typesense_client):
+    """Repeated searches skip Typesense until an import bumps the generation"""
+    searches = 0
+
+    async def handler(request):
+        nonlocal searches
+        if request.url.path.endswith("/search"):
+            searches += 1
+            return httpx.Response(200, json={"found": searches, "hits": []})
+        if request.url.path.endswith("/import"):
+            return httpx.Response(200, text='{"success": true}')
+        return httpx.Response(200, json={"name": "ossfinder"})
+
+    client = unit_typesense_client
+    client.client = httpx.AsyncClient(base_url="http://typesense:8108", transport=httpx.MockTransport(handler))
+
+    assert (await client.search("Solar"))["found"] == 1
+    assert (await client.search(" solar "))["found"] == 1
+    assert searches == 1
+
+    await client.index_data([{"Id-repo": "1"}])
+    assert (await client.search("solar"))["found"] == 2
+    assert search_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_finishing_after_an_import_is_not_cached_as_fresh(unit_typesense_client):
+    """A result fetched while an import bumped the generation belongs to the old index"""
+    searches = 0
+    fetching = asyncio.Event()
+    imported = asyncio.Event()
+
+    async def handler(request):
+        nonlocal searches
+        searches += 1
+        fetching.set()
+        await imported.wait()
+        return httpx.Response(200, json={"found": searches, "hits": []})
+
+    client = unit_typesense_client
+    client.client = httpx.AsyncClient(base_url="http://typesense:8108", transport=httpx.MockTransport(handler))
+
+    search = asyncio.create_task(client.search("solar"))
+    await fetching.wait()
+    search_cache.bump_generation()  # what an import finishing does
+    imported.set()
+    assert (await search)["found"] == 1
+
+    assert (await client.search("solar"))["found"] == 2
+    assert searches == 2
@@ -1,12 +1,16 @@
 # backend/tests/test_connection.py
+import pytest
 
-def test_typesense_connection(integration_typesense_client):
+
+@pytest.mark.asyncio
+async def test_typesense_connection(integration_typesense_client):
     """Verify basic Typesense operations"""
     # Test collection exists
-    collections = integration_typesense_client.client.collections.retrieve()
+    response = await integration_typesense_client.client.get('/collections')
+    collections = response.json()
     assert any(c['name'] == 'ossfinder' for c in collections), "Collection missing"
 
     # Test search works
-    results = integration_typesense_client.search("test")
+    results = await integration_typesense_client.search("test")
     assert isinstance(results, dict)
     assert 'hits' in results
\ No newline at end of file
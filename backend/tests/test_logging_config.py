@@ -0,0 +1,54 @@
+# backend/tests/test_logging_config.py
+import json
+import logging
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from app.logging_config import JSONFormatter, Payload, parse_levels
+from app.middleware.logging import RequestLoggerMiddleware
+
+
+def test_payload_is_truncated():
+    documents = [{"Id-repo": str(i), "description": "x" * 500} for i in range(1000)]
+    text = str(Payload(documents, limit=300))
+    assert len(text) < 400
+    assert text.endswith("more chars)")
+    assert str(Payload("short")) == "short"
+    assert str(Payload(b"\xe2\x9c\x93 raw body")) == "\u2713 raw body"
+
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.makeLogRecord({
+        "name": "app.test", "levelno": logging.INFO, "levelname": "INFO",
+        "msg": "Response: %d %s", "args": (200, "/search"), "status": 200,
+    })
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry["message"] == "Response: 200 /search"
+    assert entry["logger"] == "app.test"
+    assert entry["status"] == 200
+
+
+def test_parse_levels():
+    assert parse_levels("httpx=warning, app.typesense_client=DEBUG,bad") == {
+        "httpx": "WARNING", "app.typesense_client": "DEBUG"
+    }
+
+
+def test_access_log_sampling_keeps_server_errors(caplog):
+    async def ok(request):
+        return PlainTextResponse("ok")
+
+    async def broken(request):
+        return PlainTextResponse("broken", status_code=500)
+
+    app = Starlette(routes=[Route("/ok", ok), Route("/broken", broken)])
+    app.add_middleware(RequestLoggerMiddleware, sample_rate=0.0)
+    client = TestClient(app)
+
+    with caplog.at_level(logging.INFO, logger="app.middleware.logging"):
+        client.get("/ok")
+        client.get("/broken")
+
+    messages = [record.getMessage() for record in caplog.records if record.name == "app.middleware.logging"]
+    assert messages == ["Response: 500 /broken"]
@@ -0,0 +1,61 @@
+# backend/tests/test_metrics.py
+import httpx
+import pytest
+from typesense.exceptions import ObjectNotFound
+from app.metrics import Counter, Histogram, Registry, TYPESENSE_DURATION, TYPESENSE_ERRORS
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0), registry=registry)
+    histogram.observe(0.05, route="/search")
+    histogram.observe(0.5, route="/search")
+    histogram.observe(5, route="/search")
+
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{route="/search",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/search",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/search",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/search"} 3' in lines
+    assert 'latency_seconds_sum{route="/search"} 5.55' in lines
+
+
+
+def test_counter_value_reads_one_series():
+    counter = Counter("lookups_total", "Lookups", ("result",), registry=Registry())
+    counter.inc(result="hit")
+    counter.inc(2, result="hit")
+    assert counter.value(result="hit") == 3
+    assert counter.value(result="miss") == 0
+def test_metrics_endpoint(unit_client):
+    unit_client.get("/search", params={"q": "solar"})
+    unit_client.get("/jobs/abc123")
+    response = unit_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/search",status="200"}' in body
+    assert 'route="/jobs/{job_id}",status="404"' in body
+    assert "http_requests_in_flight" in body
+    assert "search_cache_hit_ratio" in body
+
+
+@pytest.mark.asyncio
+async def test_typesense_calls_are_measured(unit_typesense_client):
+    async def handler(request):
+        if request.url.path.endswith("/search"):
+            return httpx.Response(200, json={"found": 0, "hits": []})
+        return httpx.Response(404, json={"message": "Not found"})
+
+    unit_typesense_client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    node = unit_typesense_client.nodes.nodes[0].url
+    searches = TYPESENSE_DURATION._values.get(("search", node), [None, 0, 0])[2]
+    misses = TYPESENSE_ERRORS._values.get(("retrieve", "ObjectNotFound"), 0)
+
+    await unit_typesense_client.search("solar")
+    with pytest.raises(ObjectNotFound):
+        await unit_typesense_client._request("GET", "/collections/ossfinder/documents/missing")
+
+    assert TYPESENSE_DURATION._values[("search", node)][2] == searches + 1
+    assert TYPESENSE_ERRORS._values[("retrieve", "ObjectNotFound")] == misses + 1
@@ -0,0 +1,51 @@
+# backend/tests/test_middleware.py
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from app.middleware.security import CORSMiddlewareNew, CSRFMiddlewareNew
+
+
+async def echo(request):
+    form = await request.form()
+    return JSONResponse({"name": form.get("name")})
+
+
+def build_client(debug: bool) -> TestClient:
+    app = Starlette(routes=[Route("/echo", echo, methods=["GET", "POST"])])
+    app.add_middleware(CORSMiddlewareNew, debug=debug)
+    app.add_middleware(CSRFMiddlewareNew, secret_key="secret", debug=debug)
+    return TestClient(app, base_url="https://finder.green")
+
+
+def test_cors_headers_only_for_allowed_origins():
+    client = build_client(debug=False)
+    allowed = client.get("/echo", headers={"Origin": "https://finder.green"})
+    assert allowed.headers["Access-Control-Allow-Origin"] == "https://finder.green"
+    assert allowed.headers["Access-Control-Allow-Credentials"] == "true"
+
+    other = client.get("/echo", headers={"Origin": "https://example.com"})
+    assert "Access-Control-Allow-Origin" not in other.headers
+
+    preflight = client.options("/echo", headers={"Origin": "https://www.finder.green"})
+    assert preflight.status_code == 200
+    assert preflight.headers["Access-Control-Allow-Methods"] == "GET, POST, OPTIONS"
+
+
+def test_csrf_form_token_checked_and_body_replayed():
+    client = build_client(debug=False)
+    assert client.post("/echo", data={"name": "solar"}).status_code == 403
+
+    token = CSRFMiddlewareNew(None, secret_key="secret").serializer.dumps("session")
+    client.cookies.set("csrftoken", token)
+    response = client.post("/echo", data={"name": "solar", "csrf_token": token})
+    assert response.status_code == 200
+    assert response.json() == {"name": "solar"}
+    assert "csrftoken=" in response.headers["set-cookie"]
+
+
+def test_debug_skips_csrf_and_sets_cookie():
+    client = build_client(debug=True)
+    response = client.post("/echo", data={"name": "solar"})
+    assert response.status_code == 200
+    assert "Secure" not in response.headers["set-cookie"]
@@ -0,0 +1,129 @@
+# backend/tests/test_nodes.py
+import asyncio
+import httpx
+import pytest
+from app.nodes import NodePool, parse_node_urls
+from app.resilience import CircuitOpenError, RetryPolicy
+
+NODES = ["http://ts1:8108", "http://ts2:8108", "http://ts3:8108"]
+
+
+@pytest.fixture
+def cluster_client(unit_typesense_client):
+    """Unit client with a three-node cluster behind a fake transport"""
+    def install(handler, nearest=None):
+        unit_typesense_client.nodes = NodePool(list(NODES), nearest)
+        unit_typesense_client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        unit_typesense_client.retry_policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.001)
+        return unit_typesense_client
+    return install
+
+
+def test_parse_node_urls():
+    assert parse_node_urls(" http://ts1:8108/, http://ts2:8108 ,") == ["http://ts1:8108", "http://ts2:8108"]
+
+
+@pytest.mark.asyncio
+async def test_reads_spread_and_writes_go_to_leader(cluster_client):
+    hosts = []
+
+    async def handler(request):
+        if request.url.path == "/debug":
+            return httpx.Response(200, json={"state": 1 if request.url.host == "ts2" else 4})
+        hosts.append((request.method, request.url.host))
+        if request.method == "DELETE":
+            return httpx.Response(200, json={})
+        return httpx.Response(200, json={"found": 0, "hits": []})
+
+    client = cluster_client(handler)
+    await client.refresh_leader()
+    assert client.nodes.leader.url == "http://ts2:8108"
+
+    for i in range(6):
+        await client.search(f"q{i}")
+    await client._request('DELETE', '/collections/ossfinder/documents/a')
+
+    reads = [host for method, host in hosts if method == "GET"]
+    assert sorted(set(reads)) == ["ts1", "ts2", "ts3"]
+    assert hosts[-1] == ("DELETE", "ts2")
+
+
+@pytest.mark.asyncio
+async def test_nearest_node_preferred_while_healthy(cluster_client):
+    hosts = []
+
+    async def handler(request):
+        hosts.append(request.url.host)
+        if request.url.host == "ts3" and len(hosts) > 2:
+            return httpx.Response(503, json={"message": "Not Ready or Lagging"})
+        return httpx.Response(200, json={"found": 0, "hits": []})
+
+    client = cluster_client(handler, nearest="http://ts3:8108")
+    await client.search("a")
+    await client.search("b")
+    assert hosts == ["ts3", "ts3"]
+
+    # The nearest node fails; the retry and later reads go to the other replicas
+    await client.search("c")
+    await client.search("d")
+    assert hosts[2] == "ts3" and "ts3" not in hosts[3:]
+
+    stats = {node["url"]: node for node in client.nodes.stats()}
+    assert stats["http://ts3:8108"]["errors"] == 1
+    assert stats["http://ts3:8108"]["error_rate"] > 0
+    assert stats["http://ts1:8108"]["latency_ms"] is not None or stats["http://ts2:8108"]["latency_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_all_circuits_open_fails_fast(cluster_client):
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503, json={"message": "Not Ready or Lagging"})
+
+    client = cluster_client(handler)
+    for node in client.nodes.nodes:
+        for _ in range(node.breaker.failure_threshold):
+            node.breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        await client.search("solar")
+    assert calls == 0
+
+
+@pytest.mark.asyncio
+async def test_leader_monitor_survives_bad_rounds(cluster_client, monkeypatch):
+    """Garbage from /debug or an error while switching leaders only costs one check"""
+    probes = 0
+
+    async def handler(request):
+        nonlocal probes
+        probes += 1
+        if probes <= len(NODES):
+            return httpx.Response(200, text="<html>proxy error</html>")
+        return httpx.Response(200, json={"state": 1 if request.url.host == "ts2" else 4})
+
+    client = cluster_client(handler)
+    client.NODE_CHECK_SECONDS = 0.001
+    set_leader = client.nodes.set_leader
+    failures = []
+
+    def flaky_set_leader(node):
+        if not failures:
+            failures.append(node)
+            raise RuntimeError("boom")
+        set_leader(node)
+
+    monkeypatch.setattr(client.nodes, "set_leader", flaky_set_leader)
+    monitor = asyncio.create_task(client._monitor_nodes())
+    try:
+        for _ in range(200):
+            if client.nodes.leader is not None:
+                break
+            await asyncio.sleep(0.005)
+    finally:
+        monitor.cancel()
+
+    assert failures and client.nodes.leader.url == "http://ts2:8108"
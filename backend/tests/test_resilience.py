@@ -0,0 +1,98 @@
+# backend/tests/test_resilience.py
+import asyncio
+import time
+import httpx
+import pytest
+from typesense.exceptions import RequestMalformed, ServiceUnavailable, Timeout
+from app.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+@pytest.fixture
+def counting_client(unit_typesense_client):
+    """Unit client talking to a fake Typesense that answers with the given handler"""
+    def install(handler):
+        unit_typesense_client.client = httpx.AsyncClient(
+            base_url="http://typesense:8108", transport=httpx.MockTransport(handler)
+        )
+        unit_typesense_client.retry_policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.001)
+        for node in unit_typesense_client.nodes.nodes:
+            node.breaker = CircuitBreaker(failure_threshold=100, reset_timeout=10)
+        return unit_typesense_client
+    return install
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(counting_client):
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(400, json={"message": "Could not parse the filter query."})
+
+    client = counting_client(handler)
+    with pytest.raises(RequestMalformed):
+        await client.search("solar", filter_by="language:")
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_unavailable_is_retried_with_backoff(counting_client):
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            return httpx.Response(503, json={"message": "Not Ready or Lagging"})
+        return httpx.Response(200, json={"found": 0, "hits": []})
+
+    client = counting_client(handler)
+    assert (await client.search("solar"))["found"] == 0
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_search_never_runs_past_its_budget(counting_client):
+    async def handler(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200, json={"found": 0, "hits": []})
+
+    client = counting_client(handler)
+    client.SEARCH_BUDGET_SECONDS = 0.05
+    start = time.perf_counter()
+    with pytest.raises(Timeout):
+        await client.search("solar")
+    assert time.perf_counter() - start < 0.3
+
+
+def test_circuit_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    breaker.before_call()  # the half-open probe
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_open_circuit_returns_503(unit_client, mock_typesense, monkeypatch):
+    async def failing_search(*args, **kwargs):
+        raise CircuitOpenError(4.2)
+
+    monkeypatch.setattr(mock_typesense, "search", failing_search)
+    response = unit_client.get("/search", params={"q": "solar"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+
+
+def test_retryable_errors():
+    assert RetryPolicy.is_retryable(ServiceUnavailable("down"))
+    assert not RetryPolicy.is_retryable(RequestMalformed("bad filter"))
@@ -1,4 +1,7 @@
 # backend/tests/test_routes.py
+import time
+from typesense.exceptions import RequestMalformed
+from app.cache import search_cache
 from app.main import app  # Import Starlette app
 from app.typesense_client import TypesenseClient, get_typesense_client # Import dependency
 
@@ -54,26 +57,215 @@ def test_upload_endpoint_valid_data(unit_client, unit_typesense_client):
     }]
 
     # Mock the index_data method
-    unit_typesense_client.index_data = lambda data: None
+    async def fake_index_data(data, action=None, batch_size=None):
+        return {"action": action, "total": len(data), "imported": len(data), "failed": 0, "errors": []}
+    unit_typesense_client.index_data = fake_index_data
 
     response = unit_client.post("/upload", json=test_data)
     assert response.status_code == 200
     assert response.json()["status"] == "success"
+    assert response.json()["summary"]["imported"] == 1
+
+
+def test_upload_endpoint_rejects_unknown_action(unit_client):
+    """Only Typesense import actions are accepted"""
+    response = unit_client.post("/upload?action=replace", json=[{"Id-repo": "3"}])
+    assert response.status_code == 400
+
+def test_upload_endpoint_streams_ndjson(unit_client, unit_typesense_client):
+    """NDJSON uploads are parsed line by line and handed over as a stream"""
+    received = []
+
+    async def fake_index_stream(documents, action=None, batch_size=None):
+        async for document in documents:
+            received.append(document)
+        return {"action": action, "total": len(received), "imported": len(received), "failed": 0, "errors": []}
+
+    unit_typesense_client.index_stream = fake_index_stream
+
+    body = '{"Id-repo": "4", "name": "Four"}\n\n{"Id-repo": "5", "name": "Five"}'
+    response = unit_client.post(
+        "/upload", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.json()["summary"]["imported"] == 2
+    assert [document["Id-repo"] for document in received] == ["4", "5"]
+
+
+def test_upload_endpoint_ndjson_reports_bad_line(unit_client, unit_typesense_client):
+    """Validation errors in a stream point at the offending line"""
+    async def fake_index_stream(documents, action=None, batch_size=None):
+        async for _ in documents:
+            pass
+
+    unit_typesense_client.index_stream = fake_index_stream
+
+    body = '{"Id-repo": "6"}\n{"name": "no id"}\n'
+    response = unit_client.post(
+        "/upload", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 400
+    assert "line 2" in response.json()["error"]
+
+def test_async_upload_creates_job(unit_client, unit_typesense_client):
+    """Async uploads return a job id right away and report progress on /jobs/{id}"""
+    async def fake_index_data(data, action=None, batch_size=None):
+        return {"action": action, "total": len(data), "imported": len(data), "failed": 0, "errors": []}
+
+    unit_typesense_client.index_data = fake_index_data
+
+    test_data = [{"Id-repo": str(i)} for i in range(7)]
+    response = unit_client.post("/upload?async=1&batch_size=2", json=test_data)
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    for _ in range(50):
+        job = unit_client.get(f"/jobs/{job_id}").json()
+        if job["status"] == "completed":
+            break
+        time.sleep(0.01)
+
+    assert job["status"] == "completed"
+    assert job["processed"] == 7
+    assert job["imported"] == 7
+    assert job["progress"] == 1.0
+    assert unit_client.get("/jobs/unknown").status_code == 404
+
+
+def test_async_ndjson_upload_is_spooled(unit_client, unit_typesense_client):
+    """Async NDJSON uploads are parked in a temporary file and indexed from it in chunks"""
+    chunks = []
+
+    async def fake_index_data(data, action=None, batch_size=None):
+        chunks.append([document["Id-repo"] for document in data])
+        return {"action": action, "total": len(data), "imported": len(data), "failed": 0, "errors": []}
+
+    unit_typesense_client.index_data = fake_index_data
+    unit_typesense_client.IMPORT_CONCURRENCY = 1
+
+    body = "\n".join(f'{{"Id-repo": "{i}"}}' for i in range(5))
+    response = unit_client.post(
+        "/upload?async=1&batch_size=2", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    for _ in range(50):
+        job = unit_client.get(f"/jobs/{job_id}").json()
+        if job["status"] == "completed":
+            break
+        time.sleep(0.01)
+
+    assert job["status"] == "completed" and job["total"] == 5 and job["imported"] == 5
+    assert chunks == [["0", "1"], ["2", "3"], ["4"]]
 
 def test_health_check(unit_client, monkeypatch):
     """Test health check endpoint"""
-    # Patch the health check with a direct lambda
+    # Patch the health check with a direct coroutine
+    async def fake_health(self):
+        return {
+            "ok": True,
+            "status": "operational",
+            "version": "test"
+        }
+
     monkeypatch.setattr(
         'app.main.get_typesense_client',
-        lambda: type('MockClient', (), {
-            'health': lambda self: {
-                "ok": True,
-                "status": "operational",
-                "version": "test"
-            }
-        })()
+        lambda: type('MockClient', (), {'health': fake_health})()
     )
 
     response = unit_client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
+
+
+def test_search_endpoint_paginates(unit_client, mock_typesense):
+    """page and per_page are forwarded to Typesense"""
+    for i in range(3):
+        mock_typesense['ossfinder'].create({"Id-repo": str(i), "name": f"Solar {i}"})
+
+    response = unit_client.get("/search", params={"q": "solar", "page": 2, "per_page": 2})
+    assert response.status_code == 200
+    results = response.json()
+    assert results['found'] == 3
+    assert results['page'] == 2
+    assert len(results['hits']) == 1
+
+    assert unit_client.get("/search", params={"q": "solar", "page": "x"}).status_code == 400
+
+
+def test_search_endpoint_sends_server_timing(unit_client):
+    response = unit_client.get("/search", params={"q": "solar"})
+    timing = response.headers["Server-Timing"]
+    for phase in ("app;dur=", "total;dur="):
+        assert phase in timing
+
+
+def test_search_endpoint_rejects_unknown_facet(unit_client):
+    """facet_by is limited to the facetable ossfinder fields"""
+    response = unit_client.get("/search", params={"q": "solar", "facet_by": "description"})
+    assert response.status_code == 400
+
+
+def test_search_endpoint_rejects_malformed_filter(unit_client, mock_typesense, monkeypatch):
+    """Typesense's 400 for a bad filter_by is the client's error, not a 500"""
+    async def malformed(query, page=1, per_page=10, **options):
+        raise RequestMalformed("[Errno 400] Could not parse the filter query.")
+    monkeypatch.setattr(mock_typesense, "search_raw", malformed)
+
+    response = unit_client.get("/search", params={"q": "solar", "filter_by": "language:=["})
+    assert response.status_code == 400
+    assert response.json() == {"error": "Invalid search request: Could not parse the filter query."}
+
+
+def test_multi_search_endpoint(unit_client, mock_typesense):
+    """Several searches are answered in one request, in order"""
+    mock_typesense['ossfinder'].create({"Id-repo": "1", "name": "Solar Panel"})
+    mock_typesense['ossfinder'].create({"Id-repo": "2", "name": "Wind Farm"})
+
+    response = unit_client.post("/multi-search", json={"searches": [
+        {"q": "solar"},
+        {"q": "wind", "per_page": 5},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["hits"][0]["document"]["name"] for r in results] == ["Solar Panel", "Wind Farm"]
+
+    assert unit_client.post("/multi-search", json={"searches": []}).status_code == 400
+
+
+def test_readiness_check(unit_client, mock_typesense):
+    """Readiness is reported separately from liveness"""
+    assert unit_client.get("/ready").status_code == 200
+    mock_typesense.ready = False
+    assert unit_client.get("/ready").json() == {"ready": False}
+
+
+def test_search_endpoint_etag_and_not_modified(unit_client, mock_typesense):
+    mock_typesense['ossfinder'].create({"Id-repo": "1", "name": "Solar"})
+    response = unit_client.get("/search", params={"q": "Solar"})
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert "stale-while-revalidate=" in response.headers["Cache-Control"]
+
+    # Equivalent queries share the ETag and revalidate to 304 without a body
+    again = unit_client.get("/search", params={"q": " solar "}, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == etag
+
+    # An import moves the index generation on, so the old ETag no longer matches
+    search_cache.bump_generation()
+    changed = unit_client.get("/search", params={"q": "Solar"}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_suggest_endpoint(unit_client, mock_typesense):
+    mock_typesense['ossfinder'].create({"Id-repo": "1", "name": "Solar Panel", "organisation": "sun"})
+    response = unit_client.get("/suggest", params={"q": "sol"})
+    assert response.status_code == 200
+    assert response.json()["suggestions"][0]["name"] == "Solar Panel"
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+
+    assert unit_client.get("/suggest", params={"q": "sol", "limit": "x"}).status_code == 400
@@ -0,0 +1,88 @@
+# backend/tests/test_schema.py
+import json
+import httpx
+import pytest
+from app.schema import coerce_document, field_types
+from app.migrate import migrate
+
+
+def test_coerce_document_to_typed_schema():
+    """Counts, timestamps and flags are converted; unusable values are dropped"""
+    document = coerce_document({
+        "Id-repo": "1",
+        "name": "Solar",
+        "open_pull_requests": "12",
+        "latest_update": "2023-01-01",
+        "last_commit": "2023-01-02T12:00:00Z",
+        "is_fork": "false",
+        "forked_from": "",
+    })
+    assert document["open_pull_requests"] == 12
+    assert document["latest_update"] == 1672531200
+    assert document["last_commit"] == 1672660800
+    assert document["is_fork"] is False
+    assert document["forked_from"] == ""
+
+    assert "latest_update" not in coerce_document({"Id-repo": "2", "latest_update": "last week"})
+
+
+def test_coerce_document_to_legacy_string_schema():
+    """A collection still on the all-string schema gets strings"""
+    legacy = field_types([{"name": "open_pull_requests", "type": "string"}])
+    assert coerce_document({"open_pull_requests": 3}, legacy) == {"open_pull_requests": "3"}
+
+
+@pytest.mark.asyncio
+async def test_migrate_copies_and_swaps_alias(unit_typesense_client):
+    """Documents are exported, coerced, imported into a new collection and aliased"""
+    calls = []
+    imported = []
+
+    async def handler(request):
+        calls.append((request.method, request.url.path))
+        path = request.url.path
+        if path == "/aliases/ossfinder" and request.method == "GET":
+            return httpx.Response(404, json={"message": "Not found."})
+        if path.endswith("/documents/export"):
+            lines = [{"id": "1", "Id-repo": "1", "name": "Solar", "is_fork": "true"}]
+            return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+        if path.endswith("/documents/import"):
+            imported.extend(json.loads(line) for line in request.content.decode().splitlines())
+            return httpx.Response(200, text='{"success": true}')
+        if path.startswith("/collections/ossfinder_") and request.method == "GET":
+            return httpx.Response(200, json={"num_documents": len(imported)})
+        return httpx.Response(200, json={})
+
+    client = unit_typesense_client
+    client.client = httpx.AsyncClient(base_url="http://typesense:8108", transport=httpx.MockTransport(handler))
+
+    summary = await migrate(client)
+
+    assert summary["imported"] == 1
+    assert imported[0]["is_fork"] is True
+    assert ("DELETE", "/collections/ossfinder") in calls
+    assert ("PUT", "/aliases/ossfinder") in calls
+    assert calls.index(("DELETE", "/collections/ossfinder")) < calls.index(("PUT", "/aliases/ossfinder"))
+
+
+@pytest.mark.asyncio
+async def test_migrate_alias_failure_says_how_to_recover(unit_typesense_client, monkeypatch):
+    """If the alias cannot be created after the old collection is gone, the error names the copy"""
+    async def handler(request):
+        path = request.url.path
+        if path == "/aliases/ossfinder":
+            return httpx.Response(404 if request.method == "GET" else 503, json={"message": "Not Ready"})
+        if path.endswith("/documents/export"):
+            return httpx.Response(200, text=json.dumps({"id": "1", "Id-repo": "1", "name": "Solar"}))
+        if path.endswith("/documents/import"):
+            return httpx.Response(200, text='{"success": true}')
+        if path.startswith("/collections/ossfinder_") and request.method == "GET":
+            return httpx.Response(200, json={"num_documents": 1})
+        return httpx.Response(200, json={})
+
+    monkeypatch.setattr("app.migrate.ALIAS_RETRY_SECONDS", 0)
+    client = unit_typesense_client
+    client.client = httpx.AsyncClient(base_url="http://typesense:8108", transport=httpx.MockTransport(handler))
+
+    with pytest.raises(RuntimeError, match=r"The documents are in 'ossfinder_\d+'"):
+        await migrate(client)
@@ -0,0 +1,279 @@
+# backend/tests/test_typesense_client.py
+import asyncio
+import json
+import time
+import httpx
+import pytest
+from typesense.exceptions import Timeout
+from app.timing import start_timing
+from app.typesense_client import search_time_ms
+
+
+@pytest.fixture
+def async_typesense_client(unit_typesense_client):
+    """Unit client whose HTTP calls are routed to a per-test fake Typesense"""
+    def install(handler):
+        unit_typesense_client.client = httpx.AsyncClient(
+            base_url="http://typesense:8108",
+            transport=httpx.MockTransport(handler),
+        )
+        return unit_typesense_client
+    return install
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_overlap(async_typesense_client):
+    """Slow Typesense calls must not serialize searches on the event loop"""
+    async def handler(request):
+        if request.url.path.endswith("/search"):
+            await asyncio.sleep(0.2)
+            return httpx.Response(200, json={"found": 0, "hits": []})
+        return httpx.Response(200, json={"name": "ossfinder"})
+
+    client = async_typesense_client(handler)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client.search(f"q{i}") for i in range(5)))
+    elapsed = time.perf_counter() - start
+
+    assert all(r["found"] == 0 for r in results)
+    assert elapsed < 0.6, f"Searches ran sequentially ({elapsed:.2f}s)"
+
+
+@pytest.mark.asyncio
+async def test_search_raises_typesense_errors(async_typesense_client):
+    """HTTP errors are mapped onto the typesense exception types"""
+    from typesense.exceptions import ObjectNotFound
+
+    async def handler(request):
+        return httpx.Response(404, json={"message": "Not found."})
+
+    client = async_typesense_client(handler)
+    with pytest.raises(ObjectNotFound):
+        await client._request("GET", "/collections/ossfinder")
+
+
+@pytest.mark.asyncio
+async def test_index_data_uses_bulk_import(async_typesense_client):
+    """Documents go out as bounded, parallel JSONL batches with a per-document summary"""
+    imports = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request):
+        nonlocal in_flight, max_in_flight
+        if not request.url.path.endswith("/import"):
+            return httpx.Response(200, json={"name": "ossfinder"})
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        documents = [json.loads(line) for line in request.content.decode().splitlines()]
+        imports.append((request.url.params["action"], documents))
+        lines = [
+            {"success": False, "code": 409, "error": "A document with id dup already exists."}
+            if document["id"] == "dup" else {"success": True}
+            for document in documents
+        ]
+        return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+
+    client = async_typesense_client(handler)
+    client.IMPORT_CONCURRENCY = 2
+    data = [{"Id-repo": str(i), "open_pull_requests": i} for i in range(9)] + [{"Id-repo": "dup"}]
+
+    summary = await client.index_data(data, action="upsert", batch_size=2)
+
+    assert len(imports) == 5
+    assert max_in_flight <= 2
+    assert all(action == "upsert" for action, _ in imports)
+    assert imports[0][1][1] == {"Id-repo": "1", "open_pull_requests": 1, "id": "1"}
+    assert summary["total"] == 10
+    assert summary["imported"] == 9
+    assert summary["failed"] == 1
+    assert summary["errors"][0]["id"] == "dup"
+
+
+@pytest.mark.asyncio
+async def test_index_stream_bounds_batches_in_flight(async_typesense_client):
+    """Streamed documents are batched without materializing the whole payload"""
+    batch_sizes = []
+    consumed = 0
+    max_ahead = 0
+
+    async def handler(request):
+        if not request.url.path.endswith("/import"):
+            return httpx.Response(200, json={"name": "ossfinder"})
+        lines = request.content.decode().splitlines()
+        batch_sizes.append(len(lines))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, text="\n".join('{"success": true}' for _ in lines))
+
+    async def documents():
+        nonlocal consumed, max_ahead
+        for i in range(25):
+            consumed += 1
+            max_ahead = max(max_ahead, consumed - sum(batch_sizes))
+            yield {"Id-repo": str(i)}
+
+    client = async_typesense_client(handler)
+    client.IMPORT_CONCURRENCY = 2
+    summary = await client.index_stream(documents(), batch_size=5)
+
+    assert sorted(batch_sizes) == [5, 5, 5, 5, 5]
+    assert summary["total"] == 25
+    assert summary["imported"] == 25
+    # Two batches in flight plus the one being filled
+    assert max_ahead <= 3 * 5
+
+
+@pytest.mark.asyncio
+async def test_search_forwards_pagination_and_projection(async_typesense_client):
+    """Pagination and field projection reach Typesense; per_page is capped"""
+    seen = {}
+
+    async def handler(request):
+        if request.url.path.endswith("/search"):
+            seen.update(request.url.params)
+            return httpx.Response(200, json={"found": 0, "hits": []})
+        return httpx.Response(200, json={"name": "ossfinder"})
+
+    client = async_typesense_client(handler)
+    client.MAX_PER_PAGE = 50
+    await client.search("solar", page=3, per_page=500, include_fields="name,url")
+
+    assert seen["page"] == "3"
+    assert seen["per_page"] == "50"
+    assert seen["include_fields"] == "name,url"
+
+    with pytest.raises(ValueError):
+        await client.search("solar", bogus_option="1")
+
+
+@pytest.mark.asyncio
+async def test_search_records_server_timing(async_typesense_client):
+    """Cache lookup, Typesense round trip and Typesense's search_time_ms become phases"""
+    async def handler(request):
+        return httpx.Response(200, json={"found": 0, "hits": [], "search_time_ms": 3})
+
+    client = async_typesense_client(handler)
+    timing = start_timing()
+    await client.search("solar")
+    await client.search("solar")
+
+    phases = [(name, description) for name, _, description in timing.entries]
+    assert phases == [
+        ("cache", "miss"), ("typesense", None), ("ts-search", "Typesense search_time_ms"), ("decode", None),
+        ("cache", "hit"), ("decode", None),
+    ]
+    assert 'ts-search;dur=3.0;desc="Typesense search_time_ms"' in timing.header()
+
+
+@pytest.mark.asyncio
+async def test_search_raw_passes_typesense_bytes_through(async_typesense_client):
+    body = b'{"found":1,"hits":[{"document":{"name":"Solar \\u00e9"}}],"search_time_ms": 7}'
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+
+    client = async_typesense_client(handler)
+    assert await client.search_raw("solar") == body
+    assert await client.search_raw("solar") == body
+    assert calls == 1
+    assert (await client.search("solar"))["hits"][0]["document"]["name"] == "Solar \u00e9"
+    assert search_time_ms(body) == 7
+    assert search_time_ms(b'{"found":0}') is None
+
+
+@pytest.mark.asyncio
+async def test_multi_search_only_sends_cache_misses(async_typesense_client):
+    """Cached searches are answered locally; the rest go out in one multi_search call"""
+    bodies = []
+
+    async def handler(request):
+        if request.url.path == "/multi_search":
+            body = json.loads(request.content)
+            bodies.append(body)
+            return httpx.Response(200, json={"results": [
+                {"found": 1, "hits": [], "request_params": {"q": search["q"]}} for search in body["searches"]
+            ]})
+        return httpx.Response(200, json={"name": "ossfinder"})
+
+    client = async_typesense_client(handler)
+    first = await client.multi_search([{"q": "solar"}, {"q": "wind"}])
+    second = await client.multi_search([{"q": "wind"}, {"q": "hydro"}])
+
+    assert [r["request_params"]["q"] for r in first] == ["solar", "wind"]
+    assert [r["request_params"]["q"] for r in second] == ["wind", "hydro"]
+    assert len(bodies) == 2
+    assert [search["q"] for search in bodies[1]["searches"]] == ["hydro"]
+    assert bodies[0]["searches"][0]["collection"] == "ossfinder"
+
+
+@pytest.mark.asyncio
+async def test_suggest_is_cheap_cached_and_coalesced(async_typesense_client):
+    """Suggestions ask for little, share in-flight lookups and skip too-short prefixes"""
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"found": 1, "search_time_ms": 1, "hits": [
+            {"document": {"name": "Solar", "organisation": "sun", "url": "https://x"}, "highlight": {}},
+        ]})
+
+    client = async_typesense_client(handler)
+    bodies = await asyncio.gather(*(client.suggest("So") for _ in range(5)))
+    assert await client.suggest("  so ") == bodies[0]
+    assert await client.suggest("s") == b'{"suggestions":[]}'
+
+    assert len(requests) == 1
+    assert json.loads(bodies[0]) == {"suggestions": [{"name": "Solar", "organisation": "sun", "url": "https://x"}]}
+    params = requests[0].url.params
+    assert params["q"] == "so" and params["query_by"] == "name,organisation" and params["prefix"] == "true"
+    assert params["include_fields"] == "name,organisation,url"
+    assert params["per_page"] == str(client.SUGGEST_PER_PAGE)
+    assert params["search_cutoff_ms"] == str(client.SUGGEST_CUTOFF_MS)
+
+
+@pytest.mark.asyncio
+async def test_startup_does_not_wait_for_typesense(async_typesense_client):
+    """A slow Typesense bounds startup by the probe timeout; verification continues in the background"""
+    async def handler(request):
+        await asyncio.sleep(0.3)
+        return httpx.Response(200, json={"name": "ossfinder"})
+
+    client = async_typesense_client(handler)
+    client.STARTUP_PROBE_SECONDS = 0.05
+    start = time.perf_counter()
+    await client.startup()
+    assert time.perf_counter() - start < 0.2
+    assert not client.ready
+
+    await client._ensure_initialized()
+    assert client.ready
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_only_deadlines_count_against_a_node(async_typesense_client):
+    """A cancelled caller leaves the node's breaker alone; a request cut off by the deadline counts"""
+    async def handler(request):
+        await asyncio.sleep(0.3)
+        return httpx.Response(200, json={"found": 0, "hits": []})
+
+    client = async_typesense_client(handler)
+    node = client.nodes.nodes[0]
+
+    task = asyncio.create_task(client.search("solar"))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert node.errors == 0
+
+    client.SEARCH_BUDGET_SECONDS = 0.05
+    with pytest.raises(Timeout):
+        await client.search("wind")
+    assert node.errors == 1
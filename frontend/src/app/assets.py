@@ -0,0 +1,144 @@
+# frontend/src/app/assets.py
+"""
+Fingerprinted, precompressed static assets.
+
+build_assets() copies the static directory to where nginx serves it, adding a copy of
+every file whose name carries a hash of its content (css/styles.3f9a0c1e2b4d.css) and
+gzip and, when the brotli package is installed, brotli variants of the text assets.
+url() references in stylesheets are pointed at the fingerprinted files, and
+manifest.json maps every source path to its fingerprinted path. static_url() reads the
+manifest, so templates link to URLs that change whenever the content does and can be
+cached for a year. Without a manifest (development) it returns the plain path.
+
+    python -m app.assets [SOURCE] [DEST]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+from pathlib import PurePosixPath, Path
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # optional, only gzip variants are written then
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+SOURCE_DIR = Path(__file__).parent / "static"
+STATIC_DIR = Path(os.getenv("STATIC_DIR", "/var/www/static"))
+STATIC_URL = os.getenv("STATIC_URL", "/static/")
+MANIFEST_NAME = "manifest.json"
+
+# Text assets worth compressing; fonts (woff/woff2) and images already are
+COMPRESSIBLE = {".css", ".js", ".svg", ".ico", ".json", ".txt", ".map"}
+HASH_LENGTH = 12
+
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+def fingerprint(path: str, content: bytes) -> str:
+    """css/styles.css -> css/styles.<hash>.css"""
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    stem, dot, suffix = path.rpartition(".")
+    return f"{stem}.{digest}.{suffix}" if dot and "/" not in suffix else f"{path}.{digest}"
+
+
+def rewrite_css_urls(css_path: str, css: bytes, manifest: Dict[str, str]) -> bytes:
+    """Point relative url() references in a stylesheet at fingerprinted files"""
+    base = PurePosixPath(css_path).parent
+
+    def replace(match):
+        quote, url = match.group(1), match.group(2)
+        target = url.split("?", 1)[0].split("#", 1)[0]
+        if not target or ":" in target or target.startswith("/"):
+            return match.group(0)  # data: URIs, absolute URLs
+        resolved = os.path.normpath(str(base / target)).replace(os.sep, "/")
+        if resolved not in manifest:
+            return match.group(0)
+        relative = os.path.relpath(manifest[resolved], str(base)).replace(os.sep, "/")
+        return f"url({quote}{relative}{quote})"
+
+    return _CSS_URL.sub(replace, css.decode("utf-8")).encode("utf-8")
+
+
+def _write(path: Path, content: bytes) -> None:
+    path.parent.mkdir(exist_ok=True, parents=True)
+    path.write_bytes(content)
+    if path.suffix not in COMPRESSIBLE:
+        return
+    compressed = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed[".br"] = brotli.compress(content, quality=11)
+    for suffix, body in compressed.items():
+        if len(body) < len(content):
+            path.with_name(path.name + suffix).write_bytes(body)
+
+
+def build_assets(source: Path = SOURCE_DIR, dest: Path = STATIC_DIR) -> Dict[str, str]:
+    """Copy, fingerprint and precompress every file under ``source`` into ``dest``.
+
+    Plain names are written too, for anything that links to them directly. Earlier
+    fingerprinted files are left in place so pages cached before a deploy keep working.
+    Returns the manifest.
+    """
+    source, dest = Path(source), Path(dest)
+    files = sorted(
+        path.relative_to(source).as_posix() for path in source.rglob("*")
+        if path.is_file() and path.name != MANIFEST_NAME
+    )
+    manifest: Dict[str, str] = {}
+    # Stylesheets last, so the files they reference already have their fingerprints
+    for path in sorted(files, key=lambda name: name.endswith(".css")):
+        content = (source / path).read_bytes()
+        if path.endswith(".css"):
+            content = rewrite_css_urls(path, content, manifest)
+        manifest[path] = fingerprint(path, content)
+        _write(dest / path, content)
+        _write(dest / manifest[path], content)
+
+    manifest_path = dest / MANIFEST_NAME
+    tmp = manifest_path.with_name(MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp, manifest_path)  # readers never see half a manifest
+    load_manifest.cache_clear()
+    logger.info("Built %d static assets into %s", len(manifest), dest)
+    return manifest
+
+
+@lru_cache(maxsize=1)
+def load_manifest(path: Optional[Path] = None) -> Dict[str, str]:
+    path = path or STATIC_DIR / MANIFEST_NAME
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        logger.error("Ignoring unreadable asset manifest %s: %s", path, e)
+        return {}
+
+
+def static_url(path: str) -> str:
+    """URL of a static asset, fingerprinted when the manifest knows it (Jinja global)"""
+    return STATIC_URL + load_manifest().get(path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint and precompress static assets")
+    parser.add_argument("source", nargs="?", type=Path, default=SOURCE_DIR)
+    parser.add_argument("dest", nargs="?", type=Path, default=STATIC_DIR)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    manifest = build_assets(args.source, args.dest)
+    for path, fingerprinted in manifest.items():
+        print(f"{path} -> {fingerprinted}")
+
+
+if __name__ == "__main__":
+    main()
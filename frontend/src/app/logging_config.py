@@ -0,0 +1,133 @@
+# frontend/src/app/logging_config.py
+"""
+Structured logging that stays off the event loop.
+
+setup_logging() puts a queue handler on the root logger: the calling thread only merges
+the message and enqueues the record, while a background QueueListener thread formats it
+as JSON and writes it to stdout. Mirrored in backend/src/app/logging_config.py (the
+apps share no package), so keep the two in step.
+
+    LOG_LEVEL=INFO                                    root level (DEBUG when DEBUG=true)
+    LOG_LEVELS=httpx=WARNING,app.routes.home=DEBUG   per-logger levels
+    LOG_FORMAT=json|text
+    LOG_PAYLOAD_MAX_CHARS=2048                        cap for payloads logged with Payload()
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import reprlib
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+PAYLOAD_MAX_CHARS = int(os.getenv('LOG_PAYLOAD_MAX_CHARS', '2048'))
+
+# LogRecord attributes that are not user-supplied ``extra`` fields
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+_payload_repr = reprlib.Repr()
+_payload_repr.maxlevel = 4
+_payload_repr.maxlist = _payload_repr.maxdict = _payload_repr.maxset = _payload_repr.maxtuple = 20
+_payload_repr.maxstring = _payload_repr.maxother = 200
+
+
+class Payload:
+    """Request or response payload for a log message, rendered only if the record is emitted.
+
+    Rendering is bounded: nested containers and long strings are abbreviated, and the
+    result is cut at ``limit`` characters. Bytes (a raw body) are decoded only then too.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        self.value = value
+        self.limit = limit or PAYLOAD_MAX_CHARS
+
+    def __str__(self) -> str:
+        value = self.value
+        if isinstance(value, bytes):
+            value = value.decode("utf-8", errors="replace")
+        text = value if isinstance(value, str) else _payload_repr.repr(value)
+        if len(text) > self.limit:
+            return f"{text[:self.limit]}... ({len(text) - self.limit} more chars)"
+        return text
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line with the record's message, origin and extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES:
+                entry[name] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the message and traceback now, leave the formatting to the listener thread"""
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_levels(value: str) -> Dict[str, str]:
+    """``name=LEVEL`` pairs from a comma-separated list"""
+    levels = {}
+    for item in value.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging() -> None:
+    """Route all logging through a queue to a background writer thread (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    debug = os.getenv('DEBUG', 'false').lower() in ('true', '1', 't')
+    handler = logging.StreamHandler(sys.stdout)
+    if os.getenv('LOG_FORMAT', 'json').lower() == 'text':
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    else:
+        handler.setFormatter(JSONFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(_QueueHandler(log_queue))
+    root.setLevel(os.getenv('LOG_LEVEL', 'DEBUG' if debug else 'INFO').upper())
+    for name, level in parse_levels(os.getenv('LOG_LEVELS', '')).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,6 +1,8 @@
 # frontend/src/app/main.py
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
+import httpx
 from dotenv import load_dotenv
 from starlette.applications import Starlette
 from starlette.routing import Route, Mount
@@ -9,11 +11,14 @@ from starlette.staticfiles import StaticFiles
 from starlette.config import Config
 
 # Relative route imports
+from .assets import build_assets
+from .logging_config import setup_logging
+from .metrics import RequestMetricsMiddleware, metrics
 from .routes.home import home
-from .routes.static_pages import about, contact, privacy, terms
+from .routes.static_pages import about, contact, privacy, terms, prerender_pages, write_pages
 
 # Initialize logging
-logging.basicConfig(level=logging.DEBUG)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Initialize config
@@ -42,6 +47,14 @@ app_config = {
     "DEBUG": config("DEBUG", default=False, cast=bool),
     "STATIC_DIR": "/var/www/static",
     "BACKEND_URL": config("BACKEND_URL", default="http://localhost:8080"),
+    "BACKEND_TIMEOUT_SECONDS": config("BACKEND_TIMEOUT_SECONDS", default=5.0, cast=float),
+    "BACKEND_CONNECT_TIMEOUT_SECONDS": config("BACKEND_CONNECT_TIMEOUT_SECONDS", default=2.0, cast=float),
+    "BACKEND_MAX_CONNECTIONS": config("BACKEND_MAX_CONNECTIONS", default=100, cast=int),
+    "BACKEND_MAX_KEEPALIVE_CONNECTIONS": config("BACKEND_MAX_KEEPALIVE_CONNECTIONS", default=20, cast=int),
+    "BACKEND_KEEPALIVE_EXPIRY": config("BACKEND_KEEPALIVE_EXPIRY", default=30.0, cast=float),
+    "BACKEND_HTTP2": config("BACKEND_HTTP2", default=False, cast=bool),
+    "STATIC_PAGES_EXPORT": config("STATIC_PAGES_EXPORT", default=False, cast=bool),
+    "STATIC_ASSETS_BUILD": config("STATIC_ASSETS_BUILD", default=False, cast=bool),
     "FRIENDLY_CAPTCHA_SITE_KEY": config("FRIENDLY_CAPTCHA_SITE_KEY", default=""),
     "CSRF_SECRET_KEY": config("CSRF_SECRET_KEY", default="")
 }
@@ -64,6 +77,42 @@ except Exception as e:
     logger.error(f"Failed to create static directory: {e}")
     raise  # Re-raise the exception to fail fast in production
 
+def create_backend_client() -> httpx.AsyncClient:
+    """Pooled keep-alive client for the backend API, shared by all requests"""
+    options = dict(
+        base_url=app_config["BACKEND_URL"],
+        timeout=httpx.Timeout(
+            app_config["BACKEND_TIMEOUT_SECONDS"], connect=app_config["BACKEND_CONNECT_TIMEOUT_SECONDS"]
+        ),
+        limits=httpx.Limits(
+            max_connections=app_config["BACKEND_MAX_CONNECTIONS"],
+            max_keepalive_connections=app_config["BACKEND_MAX_KEEPALIVE_CONNECTIONS"],
+            keepalive_expiry=app_config["BACKEND_KEEPALIVE_EXPIRY"],
+        ),
+    )
+    if app_config["BACKEND_HTTP2"]:
+        # HTTP/2 needs the optional h2 package (httpx[http2]) and a backend that speaks it
+        try:
+            return httpx.AsyncClient(http2=True, **options)
+        except ImportError:
+            logger.warning("BACKEND_HTTP2 is set but h2 is not installed, using HTTP/1.1")
+    return httpx.AsyncClient(**options)
+
+@asynccontextmanager
+async def lifespan(app):
+    """Pre-render the static pages and open the shared backend client for the lifetime of the app"""
+    if app_config["STATIC_ASSETS_BUILD"]:
+        # Refresh the shared static volume, which keeps its first contents across deploys;
+        # before pre-rendering, so the pages link to this version's fingerprints
+        build_assets(dest=static_dir)
+    prerender_pages(app.state.config)
+    if app_config["STATIC_PAGES_EXPORT"]:
+        # nginx serves these directly from the shared static volume
+        write_pages(app.state.config, static_dir / "pages")
+    app.state.backend = create_backend_client()
+    yield
+    await app.state.backend.aclose()
+
 async def health_check(request):
     return JSONResponse({"status": "healthy"})
 
@@ -71,6 +120,7 @@ async def health_check(request):
 routes = [
     Route("/", home, methods=["GET"]),
     Route("/health", health_check, methods=["GET"]),
+    Route("/metrics", metrics, methods=["GET"]),
     Route("/about", about, methods=["GET"]),
     Route("/contact", contact, methods=["GET"]),
     Route("/privacy", privacy, methods=["GET"]),
@@ -80,9 +130,12 @@ routes = [
 
 app = Starlette(
     debug=app_config["DEBUG"],
-    routes=routes
+    routes=routes,
+    lifespan=lifespan,
 )
 
+app.add_middleware(RequestMetricsMiddleware)
+
 # Proper way to set app state
 app.state.config = app_config
 
@@ -0,0 +1,228 @@
+# frontend/src/app/metrics.py
+"""
+Prometheus metrics, served as text exposition format on GET /metrics.
+
+Counters, gauges and histograms are plain in-process dicts keyed by label values and
+updated from the event loop, so recording a sample is a dict lookup and a bisect.
+The metric classes are mirrored in backend/src/app/metrics.py: the two apps are
+separate packages in separate images with nothing shared between them, so keep
+changes to the classes in step.
+Requests are recorded by RequestMetricsMiddleware and backend calls by the home route.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers cache hits (sub-millisecond) up to the Typesense timeout
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Registry:
+    """The metrics exposed on /metrics"""
+
+    def __init__(self):
+        self.metrics: List["Metric"] = []
+
+    def register(self, metric: "Metric") -> None:
+        self.metrics.append(metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class Metric:
+    TYPE = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[Registry] = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def value(self, **labels) -> object:
+        """Current value of one series (0 if it was never recorded)"""
+        return self._values.get(self._key(labels), 0)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{self._labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, value: float, **labels) -> None:
+        """Mirror a total counted elsewhere"""
+        self._values[self._key(labels)] = value
+
+
+class Gauge(Metric):
+    TYPE = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional[Registry] = REGISTRY):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        series = self._values.get(key)
+        if series is None:
+            # Per-bucket counts (the last one is +Inf), sum, count
+            series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{self._labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {count}")
+        return lines
+
+
+def route_label(scope) -> str:
+    """Route template of a handled request (``/jobs/{job_id}``), bounded for unmatched paths"""
+    if "endpoint" not in scope:
+        return "unmatched"
+    path = scope["path"]
+    for name, value in scope.get("path_params", {}).items():
+        value = str(value)
+        if value and path.endswith(value):
+            path = path[:-len(value)] + "{" + name + "}"
+        elif value:
+            path = path.replace(f"/{value}/", f"/{{{name}}}/", 1)
+    return path
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to handle a request", ("method", "route", "status")
+)
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being handled")
+REQUESTS_IN_FLIGHT.set(0)
+BACKEND_DURATION = Histogram(
+    "backend_request_duration_seconds", "Backend API call latency per endpoint", ("endpoint",)
+)
+BACKEND_ERRORS = Counter(
+    "backend_errors_total", "Failed backend API calls per endpoint and error type", ("endpoint", "error")
+)
+# Streamed search pages send Server-Timing before the backend answers, so their phases are kept here
+SEARCH_PAGE_PHASE_DURATION = Histogram(
+    "search_page_phase_seconds", "Phases of streamed search page responses (backend, ts-search, render)", ("phase",)
+)
+
+PAGE_CACHE_LOOKUPS = Counter(
+    "page_cache_lookups_total", "Pre-rendered page lookups by outcome (miss renders the page)", ("result",)
+)
+PAGE_CACHE_HIT_RATIO = Gauge("page_cache_hit_ratio", "Pre-rendered page hits over lookups")
+
+
+class RequestMetricsMiddleware:
+    """Count every request in the request latency and in-flight metrics.
+
+    Responses also get the time to their headers as Server-Timing ``total``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append(
+                    "server-timing", f"total;dur={(time.perf_counter() - started) * 1000:.1f}"
+                )
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            REQUEST_DURATION.observe(
+                time.perf_counter() - started, method=scope["method"], route=route_label(scope), status=status
+            )
+
+
+def _collect_page_cache() -> None:
+    hits = PAGE_CACHE_LOOKUPS.value(result="hit")
+    lookups = hits + PAGE_CACHE_LOOKUPS.value(result="miss")
+    PAGE_CACHE_HIT_RATIO.set(hits / lookups if lookups else 0)
+
+
+async def metrics(request: Request) -> Response:
+    _collect_page_cache()
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -1,56 +1,187 @@
 # frontend/src/app/routes/home.py
-# from starlette.responses import HTMLResponse
+from jinja2 import Environment, FileSystemLoader
+from starlette.responses import HTMLResponse, StreamingResponse
 from starlette.templating import Jinja2Templates
-import httpx
 import os
 import logging
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode
 from starlette.requests import Request
+from ..assets import static_url
+from ..logging_config import Payload
+from ..metrics import BACKEND_DURATION, BACKEND_ERRORS, SEARCH_PAGE_PHASE_DURATION
+from ..streaming import render_stream
+from ..timing import ServerTiming
 
 # Initialize logging
 logger = logging.getLogger(__name__)
 
-# Initialize Jinja2 templates
-templates = Jinja2Templates(directory=os.path.join(os.path.dirname(__file__), "../templates"))
+# Initialize Jinja2 templates; async so index.html can await the search while streaming
+templates = Jinja2Templates(env=Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), "../templates")),
+    autoescape=True,
+    enable_async=True,
+))
+templates.env.globals["static_url"] = static_url
+
+
+def format_date(value, fmt: str = "%Y-%m-%d") -> str:
+    """Render an int64 epoch timestamp as a UTC date; other values (older string data) pass through"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value, timezone.utc).strftime(fmt)
+    return value or ""
+
+
+templates.env.filters["date"] = format_date
+
+# Only the document fields index.html renders; highlights are not shown
+RESULT_FIELDS = "name,url,latest_update,organisation,language,description,last_commit,license"
+
+# Facets rendered next to the results: field name -> label
+FACETS = {"language": "Language", "license": "License", "is_fork": "Fork"}
+MAX_FACET_VALUES = 10
+
+
+def build_filter_by(filters):
+    """Typesense filter_by expression for the selected facet values"""
+    clauses = []
+    for field, values in filters.items():
+        if field == "is_fork":
+            # Selecting both true and false is no filter at all
+            if len(set(values)) == 1 and values[0] in ("true", "false"):
+                clauses.append(f"is_fork:={values[0]}")
+        elif values:
+            escaped = ",".join(f"`{value.replace('`', '')}`" for value in values)
+            clauses.append(f"{field}:=[{escaped}]")
+    return " && ".join(clauses)
+
+
+def filter_params(filters):
+    return [(field, value) for field, values in filters.items() for value in values]
+
+
+def search_params(query, page, per_page, filters):
+    """Query parameters for the backend /search call; filter_by is only sent when set"""
+    params = {
+        "q": query,
+        "page": page,
+        "per_page": per_page,
+        "include_fields": RESULT_FIELDS,
+        "enable_highlight_v1": "false",
+        "facet_by": ",".join(FACETS),
+        "max_facet_values": MAX_FACET_VALUES,
+    }
+    filter_by = build_filter_by(filters)
+    if filter_by:
+        params["filter_by"] = filter_by
+    return params
+
+
+def build_facets(facet_counts, query, per_page, filters):
+    """Facet groups with counts and a link that toggles each value"""
+    facets = []
+    for facet in facet_counts:
+        field = facet.get("field_name")
+        if field not in FACETS:
+            continue
+        values = []
+        for count in facet.get("counts", []):
+            value = str(count.get("value", ""))
+            selected = value in filters.get(field, [])
+            toggled = {name: list(vals) for name, vals in filters.items()}
+            if selected:
+                toggled[field].remove(value)
+            else:
+                toggled.setdefault(field, []).append(value)
+            values.append({
+                "value": value,
+                "count": count.get("count", 0),
+                "selected": selected,
+                "url": "?" + urlencode([("q", query), ("per_page", per_page)] + filter_params(toggled)),
+            })
+        if values:
+            facets.append({"field": field, "label": FACETS[field], "values": values})
+    return facets
+
+
+async def fetch_results(request: Request, query, page, per_page, filters, timing: ServerTiming):
+    """Search the backend; index.html calls this once the page head has been sent"""
+    search = {"results": None, "facets": [], "error": None, "per_page": per_page, "total_results": 0, "total_pages": 0}
+    if not query:
+        return search
+
+    started = time.perf_counter()
+    try:
+        response = await request.app.state.backend.get("/search", params=search_params(query, page, per_page, filters))
+        elapsed = time.perf_counter() - started
+        BACKEND_DURATION.observe(elapsed, endpoint="/search")
+        timing.add("backend", elapsed * 1000)
+        logger.debug("Backend response: %s", Payload(response.content))  # Decoded only if logged
+        if response.status_code == 200:
+            data = response.json()
+            if "search_time_ms" in data:
+                timing.add("ts-search", data["search_time_ms"], "Typesense search_time_ms")
+            total_results = data.get("found", 0)  # Use "found" instead of "total_results"
+            # The backend may have capped per_page
+            per_page = data.get("request_params", {}).get("per_page", per_page)
+            search.update(
+                results=data.get("hits", []),  # Use "hits" instead of "results"
+                per_page=per_page,
+                total_results=total_results,
+                total_pages=(total_results + per_page - 1) // per_page,
+                facets=build_facets(data.get("facet_counts", []), query, per_page, filters),
+            )
+        else:
+            BACKEND_ERRORS.inc(endpoint="/search", error=response.status_code)
+            search["error"] = f"Backend error: {response.text}"
+            logger.error(search["error"])
+    except Exception as e:
+        BACKEND_ERRORS.inc(endpoint="/search", error=type(e).__name__)
+        search["error"] = f"Failed to connect to the backend: {str(e)}"
+        logger.error(search["error"])
+    return search
+
+
+async def stream_page(template, context, timing: ServerTiming):
+    """Stream a results page, then record its phases, which the header went out without"""
+    with timing.measure("render"):
+        async for chunk in render_stream(template, context):
+            yield chunk
+    for name, duration_ms, _ in timing.entries:
+        SEARCH_PAGE_PHASE_DURATION.observe(duration_ms / 1000, phase=name)
+    logger.debug("Search phases: %s", timing.header())
+
 
 async def home(request: Request):
+    """Search page.
+
+    With a query the page is streamed: the head and search form are sent before the
+    backend answers, so the Server-Timing header only has the middleware's ``total``
+    (time to first byte); the backend, ts-search and render phases go to the
+    ``search_page_phase_seconds`` metric instead. Without one it is rendered in one go
+    and the header also shows the render and app phases.
+    """
+    timing = ServerTiming()
+    app_started = time.perf_counter()
     query = request.query_params.get("q", "")
     page = int(request.query_params.get("page", 1))
     per_page = int(request.query_params.get("per_page", 10))
-    results = None
-    error = None
-    total_results = 0
-    total_pages = 0
+    filters = {field: request.query_params.getlist(field) for field in FACETS if request.query_params.getlist(field)}
+    template = templates.get_template("index.html")
+    context = {
+        "request": request,
+        "query": query,
+        "search_results": lambda: fetch_results(request, query, page, per_page, filters, timing),
+        "filter_query": urlencode(filter_params(filters)),
+        "page": page,
+    }
 
     if query:
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"http://backend:8000/search?q={query}&page={page}&per_page={per_page}"
-                )
-                logger.debug(f"Backend response: {response.text}")  # Log the raw response
-                if response.status_code == 200:
-                    data = response.json()
-                    logger.debug(f"Parsed data: {data}")  # Log the parsed data
-                    results = data.get("hits", [])  # Use "hits" instead of "results"
-                    total_results = data.get("found", 0)  # Use "found" instead of "total_results"
-                    total_pages = (total_results + per_page - 1) // per_page
-                else:
-                    error = f"Backend error: {response.text}"
-                    logger.error(error)
-        except Exception as e:
-            error = f"Failed to connect to the backend: {str(e)}"
-            logger.error(error)
-
-    return templates.TemplateResponse(
-        request, "index.html",
-        {
-            "request": request,
-            "query": query,
-            "results": results,
-            "error": error,
-            "page": page,
-            "per_page": per_page,
-            "total_results": total_results,
-            "total_pages": total_pages,
-        },
-    )
+        return StreamingResponse(stream_page(template, context, timing), media_type="text/html")
+
+    with timing.measure("render"):
+        response = HTMLResponse(await template.render_async(context))
+    timing.add("app", (time.perf_counter() - app_started) * 1000)
+    response.headers["Server-Timing"] = timing.header()
+    return response
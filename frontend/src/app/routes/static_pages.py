@@ -1,56 +1,186 @@
 # frontend/src/app/routes/static_pages.py
+"""
+About, contact, privacy and terms pages.
+
+Their content only changes on deploy, so each page is rendered once (at startup, or on
+its first request) into bytes with gzip and, when the brotli package is installed,
+brotli variants. Responses carry a strong ETag per variant and Last-Modified, and
+revalidation gets a 304. write_pages() puts the same bytes on disk for nginx.
+"""
+
 from starlette.templating import Jinja2Templates
 from starlette.requests import Request
-from starlette.responses import JSONResponse
-from datetime import datetime
+from starlette.responses import Response
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict
+import gzip
+import hashlib
 import os
 import logging
 
+from ..assets import static_url
+from ..metrics import PAGE_CACHE_LOOKUPS
+
+try:
+    import brotli
+except ImportError:  # optional, pages are then served as gzip or identity only
+    brotli = None
+
 logger = logging.getLogger(__name__)
 
 templates = Jinja2Templates(directory=os.path.join(os.path.dirname(__file__), "../templates"))
+templates.env.globals["static_url"] = static_url
+
+# Page name (also its path) -> template and title
+PAGES = {
+    "about": ("about.html", "About Us - Pers"),
+    "contact": ("contact.html", "Contact - Pers"),
+    "privacy": ("privacy.html", "Privacy Policy - Pers"),
+    "terms": ("terms.html", "Terms of Service - Pers"),
+}
+
+PAGE_MAX_AGE = int(os.getenv("STATIC_PAGE_MAX_AGE", "3600"))
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
 
-def get_base_context(request: Request, active_page: str = ""):
-    """Shared context for all pages"""
+def get_base_context(config, active_page: str = "", now: datetime = None):
+    """Shared context for all pages; rendered without a request, so templates can't use one"""
     return {
-        "request": request,
-        "config": request.app.state.config,
+        "config": config,
         "active_page": active_page,
-        "now": datetime.now(),  # For last updated dates
+        "now": now or datetime.now(timezone.utc),  # For last updated dates
     }
 
 
-async def about(request: Request):
-    context = get_base_context(request, "about")
-    return templates.TemplateResponse(
-        request,
-        "about.html",
-        {**context, "meta_title": "About Us - Pers"}
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Content codings from an Accept-Encoding header with their q values"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        name, _, value = params.partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if coding.strip():
+            accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+class RenderedPage:
+    """A page rendered to bytes, with its compressed variants and validators"""
+
+    def __init__(self, body: bytes, rendered_at: datetime):
+        self.variants = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(body, quality=11)
+        digest = hashlib.sha256(body).hexdigest()[:20]
+        # Each variant is a different byte sequence, so each gets its own strong ETag
+        self.etags = {
+            encoding: f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+            for encoding in self.variants
+        }
+        self.last_modified = rendered_at.replace(microsecond=0)
+
+    def choose_encoding(self, accept_encoding: str) -> str:
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in ENCODINGS:
+            if encoding in self.variants and accepted.get(encoding, accepted.get("*", 0)) > 0:
+                return encoding
+        return "identity"
+
+    def not_modified(self, request: Request, etag: str) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or etag in tags
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since) >= self.last_modified
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def response(self, request: Request) -> Response:
+        encoding = self.choose_encoding(request.headers.get("accept-encoding", ""))
+        headers = {
+            "ETag": self.etags[encoding],
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+            "Cache-Control": f"public, max-age={PAGE_MAX_AGE}",
+            "Vary": "Accept-Encoding",
+        }
+        if self.not_modified(request, self.etags[encoding]):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(self.variants[encoding], headers=headers, media_type="text/html")
+
+
+_pages: Dict[str, RenderedPage] = {}
+
+
+def render_page(name: str, config) -> RenderedPage:
+    template, title = PAGES[name]
+    rendered_at = datetime.now(timezone.utc)
+    html = templates.get_template(template).render(
+        {**get_base_context(config, name, rendered_at), "meta_title": title}
     )
+    _pages[name] = RenderedPage(html.encode("utf-8"), rendered_at)
+    return _pages[name]
+
+
+def prerender_pages(config) -> None:
+    """Render every page up front so no request pays for it"""
+    for name in PAGES:
+        render_page(name, config)
+    logger.info("Pre-rendered pages: %s", ", ".join(PAGES))
+
+
+def write_pages(config, directory) -> None:
+    """Write every page and its compressed variants as <name>.html[.gz|.br] for nginx"""
+    directory = Path(directory)
+    directory.mkdir(exist_ok=True, parents=True)
+    for name in PAGES:
+        page = _pages.get(name) or render_page(name, config)
+        for encoding, body in page.variants.items():
+            path = directory / f"{name}.html{ENCODINGS.get(encoding, '')}"
+            # Replace atomically so nginx never serves a half-written file
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, path)
+    logger.info("Wrote static pages to %s", directory)
+
+
+def serve_page(request: Request, name: str) -> Response:
+    page = _pages.get(name)
+    if page is None:
+        PAGE_CACHE_LOOKUPS.inc(result="miss")
+        page = render_page(name, request.app.state.config)
+    else:
+        PAGE_CACHE_LOOKUPS.inc(result="hit")
+    return page.response(request)
+
+
+async def about(request: Request):
+    return serve_page(request, "about")
 
 
 async def contact(request: Request):
     """Handle GET requests for contact page"""
-    context = get_base_context(request, "contact")
-    return templates.TemplateResponse(
-        request,  # Request now comes first
-        "contact.html",
-        {**context, "meta_title": "Contact - Pers"}
-    )
+    return serve_page(request, "contact")
+
 
 async def privacy(request: Request):
-    context = get_base_context(request, "privacy")
-    return templates.TemplateResponse(
-        request,
-        "privacy.html",
-        {**context, "meta_title": "Privacy Policy - Pers"}
-    )
+    return serve_page(request, "privacy")
 
 
 async def terms(request: Request):
-    context = get_base_context(request, "terms")
-    return templates.TemplateResponse(
-        request,
-        "terms.html",
-        {**context, "meta_title": "Terms of Service - Pers"}
-    )
+    return serve_page(request, "terms")
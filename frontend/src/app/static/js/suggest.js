@@ -0,0 +1,131 @@
+// frontend/src/app/static/js/suggest.js
+// Search-as-you-type for inputs with data-suggest-url: debounced lookups against the
+// backend's /suggest, answers remembered per prefix, and stale requests aborted.
+(function () {
+    'use strict';
+
+    const DEBOUNCE_MS = 150;
+    const MIN_CHARS = 2;
+
+    const input = document.querySelector('input[data-suggest-url]');
+    if (!input || !window.fetch) {
+        return;
+    }
+
+    const url = input.dataset.suggestUrl;
+    const seen = new Map();
+    let timer = null;
+    let controller = null;
+
+    const list = document.createElement('div');
+    list.id = 'search-suggestions';
+    list.className = 'list-group shadow-sm suggestions';
+    list.setAttribute('role', 'listbox');
+    list.hidden = true;
+    input.parentElement.classList.add('position-relative');
+    input.parentElement.appendChild(list);
+    input.setAttribute('autocomplete', 'off');
+    input.setAttribute('aria-autocomplete', 'list');
+    input.setAttribute('aria-controls', list.id);
+
+    function hide() {
+        list.hidden = true;
+        list.replaceChildren();
+    }
+
+    function render(suggestions) {
+        if (!suggestions.length) {
+            hide();
+            return;
+        }
+        list.replaceChildren(...suggestions.map(function (suggestion) {
+            const item = document.createElement('button');
+            item.type = 'button';
+            item.className = 'list-group-item list-group-item-action';
+            item.setAttribute('role', 'option');
+            item.textContent = suggestion.name;
+            if (suggestion.organisation) {
+                const organisation = document.createElement('small');
+                organisation.className = 'text-muted ms-2';
+                organisation.textContent = suggestion.organisation;
+                item.appendChild(organisation);
+            }
+            item.addEventListener('click', function () {
+                input.value = suggestion.name;
+                hide();
+                input.form.submit();
+            });
+            return item;
+        }));
+        list.hidden = false;
+    }
+
+    async function lookup(prefix) {
+        if (seen.has(prefix)) {
+            render(seen.get(prefix));
+            return;
+        }
+        if (controller) {
+            controller.abort();
+        }
+        controller = new AbortController();
+        try {
+            const response = await fetch(url + '?q=' + encodeURIComponent(prefix), {
+                signal: controller.signal,
+                headers: {'Accept': 'application/json'},
+            });
+            if (!response.ok) {
+                hide();
+                return;
+            }
+            const suggestions = (await response.json()).suggestions || [];
+            seen.set(prefix, suggestions);
+            if (input.value.trim().toLowerCase() === prefix) {
+                render(suggestions);
+            }
+        } catch (error) {
+            if (error.name !== 'AbortError') {
+                hide();
+            }
+        }
+    }
+
+    input.addEventListener('input', function () {
+        clearTimeout(timer);
+        const prefix = input.value.trim().toLowerCase();
+        if (prefix.length < MIN_CHARS) {
+            hide();
+            return;
+        }
+        timer = setTimeout(function () { lookup(prefix); }, DEBOUNCE_MS);
+    });
+
+    input.addEventListener('keydown', function (event) {
+        if (event.key === 'Escape') {
+            hide();
+        } else if (event.key === 'ArrowDown' && !list.hidden) {
+            event.preventDefault();
+            list.firstElementChild.focus();
+        }
+    });
+
+    list.addEventListener('keydown', function (event) {
+        const item = document.activeElement;
+        if (event.key === 'ArrowDown' && item.nextElementSibling) {
+            event.preventDefault();
+            item.nextElementSibling.focus();
+        } else if (event.key === 'ArrowUp') {
+            event.preventDefault();
+            (item.previousElementSibling || input).focus();
+        } else if (event.key === 'Escape') {
+            hide();
+            input.focus();
+        }
+    });
+
+    document.addEventListener('click', function (event) {
+        if (event.target !== input && !list.contains(event.target)) {
+            hide();
+        }
+    });
+})();
@@ -0,0 +1,49 @@
+# frontend/src/app/streaming.py
+"""
+Streaming template rendering.
+
+render_stream() renders a template through Jinja's async generate API. Chunks rendered
+without the template waiting on anything are joined into one body message, so
+everything up to the first awaited call in the template (the head, CSS and JS links and
+navigation) goes out at once, and the rest follows when that call returns.
+"""
+
+import asyncio
+from typing import AsyncIterator
+
+from jinja2 import Template
+
+_DONE = object()
+
+
+async def render_stream(template: Template, context: dict) -> AsyncIterator[bytes]:
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce() -> None:
+        try:
+            async for chunk in template.generate_async(context):
+                queue.put_nowait(chunk)
+        except Exception as exc:
+            queue.put_nowait(exc)
+        else:
+            queue.put_nowait(_DONE)
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            # The producer only gives up the loop when the template awaits, so whatever
+            # is queued by then is everything renderable so far
+            parts = [await queue.get()]
+            while not queue.empty():
+                parts.append(queue.get_nowait())
+            last = parts[-1]
+            text = "".join(parts if isinstance(last, str) else parts[:-1])
+            if text:
+                yield text.encode("utf-8")
+            if isinstance(last, Exception):
+                raise last
+            if last is _DONE:
+                return
+    finally:
+        # Client went away mid-render
+        task.cancel()
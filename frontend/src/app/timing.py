@@ -0,0 +1,36 @@
+# frontend/src/app/timing.py
+"""
+Server-Timing phase breakdown for responses. RequestMetricsMiddleware appends the
+overall ``total``.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+
+class ServerTiming:
+    """Named durations rendered as a Server-Timing header value"""
+
+    def __init__(self):
+        self.entries: List[Tuple[str, float, Optional[str]]] = []
+
+    def add(self, name: str, duration_ms: float, description: Optional[str] = None) -> None:
+        self.entries.append((name, duration_ms, description))
+
+    @contextmanager
+    def measure(self, name: str, description: Optional[str] = None) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000, description)
+
+    def header(self) -> str:
+        parts = []
+        for name, duration_ms, description in self.entries:
+            part = f"{name};dur={duration_ms:.1f}"
+            if description:
+                part += f';desc="{description}"'
+            parts.append(part)
+        return ", ".join(parts)
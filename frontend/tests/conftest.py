@@ -6,4 +6,6 @@ from app.main import app  # Updated import path
 
 @pytest.fixture
 def client():
-    return TestClient(app)
\ No newline at end of file
+    # Entering the client runs the lifespan, which opens the shared backend client
+    with TestClient(app) as client:
+        yield client
\ No newline at end of file
@@ -1,4 +1,5 @@
 # frontend/tests/test_ui_routes.py
+import httpx
 import pytest
 from starlette.testclient import TestClient
 from app.main import app
@@ -6,7 +7,9 @@ from app.main import app
 
 @pytest.fixture
 def client():
-    return TestClient(app)
+    # Entering the client runs the lifespan, which opens the shared backend client
+    with TestClient(app) as client:
+        yield client
 
 
 def test_home_page_renders_correctly(client):
@@ -46,4 +49,140 @@ def test_contact_page_renders_correctly(client):
     assert "Fancy a proper chat?" in response.text
     assert "https://tymyrddin.dev/contact/" in response.text
     assert "https://github.com/ninabarzh/pers/issues" in response.text
-    assert "biscuits" in response.text  # Testing our sense of humour
\ No newline at end of file
+    assert "biscuits" in response.text  # Testing our sense of humour
+
+def test_build_filter_by_from_selected_facets():
+    """Selected facet values become one Typesense filter_by expression"""
+    from app.routes.home import build_filter_by
+
+    assert build_filter_by({"language": ["Python", "Go"], "is_fork": ["false"]}) == \
+        "language:=[`Python`,`Go`] && is_fork:=false"
+    assert build_filter_by({"is_fork": ["true", "false"]}) == ""
+
+
+def test_date_filter_formats_epoch_timestamps():
+    """latest_update and last_commit are int64 epoch seconds in the typed schema"""
+    from app.routes.home import templates
+
+    render = templates.env.from_string("{{ value | date }}").render
+    assert render(value=1700000000) == "2023-11-14"
+    assert render(value="2024-10-28") == "2024-10-28"
+    assert render(value=None) == ""
+
+
+def test_metrics_endpoint(client):
+    client.get("/about")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert 'http_request_duration_seconds_count{method="GET",route="/about",status="200"}' in response.text
+    assert "http_requests_in_flight" in response.text
+
+
+def test_home_sends_server_timing(client):
+    timing = client.get("/").headers["Server-Timing"]
+    for phase in ("render;dur=", "app;dur=", "total;dur="):
+        assert phase in timing
+    # Results pages are streamed, so only the time to first byte is known up front
+    assert client.get("/?q=solar").headers["Server-Timing"].startswith("total;dur=")
+    # ...and their phases are recorded as metrics once the page is done
+    assert 'search_page_phase_seconds_count{phase="render"}' in client.get("/metrics").text
+
+
+@pytest.mark.asyncio
+async def test_render_stream_flushes_before_awaiting():
+    """Everything rendered before the template awaits goes out as one chunk first"""
+    import asyncio
+    from jinja2 import DictLoader, Environment
+    from app.streaming import render_stream
+
+    answered = asyncio.Event()
+
+    async def search():
+        await answered.wait()
+        return "results"
+
+    env = Environment(loader=DictLoader({"page.html": "<head>{{ title }}</head><nav/>{{ search() }}<footer/>"}),
+                      enable_async=True)
+    stream = render_stream(env.get_template("page.html"), {"title": "Pers", "search": search})
+    assert await stream.__anext__() == b"<head>Pers</head><nav/>"
+    answered.set()
+    assert [chunk async for chunk in stream] == [b"results<footer/>"]
+
+
+def test_home_uses_shared_backend_client(client):
+    """Searches go through app.state.backend with encoded params and no empty filter_by"""
+    seen = []
+
+    def handler(request):
+        seen.append(request.url)
+        return httpx.Response(200, json={"found": 0, "hits": [], "search_time_ms": 1})
+
+    shared = app.state.backend
+    app.state.backend = httpx.AsyncClient(base_url="http://backend.test", transport=httpx.MockTransport(handler))
+    try:
+        client.get("/", params={"q": "solar & wind", "language": "C++"})
+        client.get("/", params={"q": "solar"})
+    finally:
+        app.state.backend = shared
+
+    assert seen[0].host == "backend.test" and seen[0].path == "/search"
+    assert seen[0].params["q"] == "solar & wind"
+    assert seen[0].params["filter_by"] == "language:=[`C++`]"
+    assert "filter_by" not in seen[1].params
+    metrics = client.get("/metrics").text
+    for phase in ("backend", "ts-search"):
+        assert f'search_page_phase_seconds_count{{phase="{phase}"}}' in metrics
+
+
+def test_static_page_is_cached_with_validators(client):
+    """Pre-rendered pages come gzipped with a strong ETag and revalidate to 304"""
+    response = client.get("/privacy", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    etag = response.headers["etag"]
+    assert etag.startswith('"') and etag.endswith('-gzip"')
+    assert "Privacy Policy" in response.text
+
+    plain = client.get("/privacy", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] != etag
+
+    revalidated = client.get("/privacy", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    since = client.get("/privacy", headers={"If-Modified-Since": response.headers["last-modified"]})
+    assert since.status_code == 304
+
+
+def test_write_pages(tmp_path):
+    from app.routes.static_pages import PAGES, write_pages
+
+    write_pages(app.state.config, tmp_path)
+    for name in PAGES:
+        assert (tmp_path / f"{name}.html").read_bytes().startswith(b"<!DOCTYPE html>")
+        assert (tmp_path / f"{name}.html.gz").exists()
+
+
+def test_build_assets_fingerprints_and_compresses(tmp_path, monkeypatch):
+    """Assets get content-hashed copies, gzip variants and a manifest static_url() uses"""
+    from app import assets
+
+    manifest = assets.build_assets(dest=tmp_path)
+    css = manifest["css/bootstrap.min.css"]
+    assert css.startswith("css/bootstrap.min.") and css.endswith(".css") and css != "css/bootstrap.min.css"
+    assert (tmp_path / css).read_bytes() == (tmp_path / "css/bootstrap.min.css").read_bytes()
+    assert (tmp_path / (css + ".gz")).exists()
+    assert not (tmp_path / (manifest["fonts/bootstrap-icons.woff2"] + ".gz")).exists()
+
+    # Stylesheets point at the fingerprinted fonts
+    icons = (tmp_path / manifest["fonts/bootstrap-icons.css"]).read_text()
+    assert f'url("{manifest["fonts/bootstrap-icons.woff2"].split("/")[-1]}")' in icons
+
+    monkeypatch.setattr(assets, "STATIC_DIR", tmp_path)
+    assets.load_manifest.cache_clear()
+    try:
+        assert assets.static_url("css/bootstrap.min.css") == "/static/" + css
+        assert assets.static_url("unknown.txt") == "/static/unknown.txt"
+    finally:
+        assets.load_manifest.cache_clear()